@@ -1,3 +1,11 @@
-from .suap import SUAPAPI
+from .boletim import Boletim, SubjectGrade, format_grade
+from .suap import SUAPAPI, AsyncSUAPAPI, get_client, get_async_client
+from .history import PeriodStats, build_history
+from .solver import GradeSolver, detect_course
+from .changes import diff_boletins
+from .limiter import SUAPUnavailable
+from .metrics import metrics, track_timings
+from .stale import track_stale
+from .profiling import profiled, track_thread_profiles
 
-__all__ = ['SUAPAPI']
+__all__ = ['SUAPAPI', 'AsyncSUAPAPI', 'get_client', 'get_async_client', 'Boletim', 'SubjectGrade', 'format_grade', 'PeriodStats', 'build_history', 'GradeSolver', 'detect_course', 'diff_boletins', 'SUAPUnavailable', 'metrics', 'track_timings', 'track_stale', 'profiled', 'track_thread_profiles']
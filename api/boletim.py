@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
+
+MEDIA_APROVACAO = 60
+LIMITE_FALTAS = 0.25  # Fração da carga horária que o aluno pode faltar
+
+
+def _to_int(value, default: int = 0) -> int:
+    try:
+        return int(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def format_grade(value: Optional[float], default: str = '') -> str:
+    """Formata uma nota para exportação, sem casas decimais desnecessárias"""
+    return default if value is None else f'{value:g}'
+
+
+def _nota(subject: Dict[str, Any], field: str) -> Optional[float]:
+    return _to_float((subject.get(field) or {}).get('nota'))
+
+
+@dataclass(frozen=True, slots=True)
+class SubjectGrade:
+    """Uma disciplina do boletim, com os campos do SUAP já convertidos"""
+    disciplina: str
+    carga_horaria: int
+    carga_horaria_cumprida: int
+    faltas: int
+    frequencia: float
+    nota1: Optional[float]
+    nota2: Optional[float]
+    nota3: Optional[float]
+    nota4: Optional[float]
+    media: Optional[float]
+    nota_final: Optional[float]
+    media_final: Optional[float]
+    situacao_suap: str
+    aprovado: bool
+    max_faltas: float
+    faltas_restantes: float
+
+    @classmethod
+    def from_api(cls, subject: Dict[str, Any]) -> 'SubjectGrade':
+        carga_horaria = _to_int(subject.get('carga_horaria'))
+        faltas = _to_int(subject.get('numero_faltas'))
+        nota1 = _nota(subject, 'nota_etapa_1')
+        nota2 = _nota(subject, 'nota_etapa_2')
+        media = _to_float(subject.get('media_disciplina'))
+        situacao = subject.get('situacao') or 'Cursando'
+        max_faltas = carga_horaria * LIMITE_FALTAS
+
+        return cls(
+            disciplina=subject.get('disciplina') or '',
+            carga_horaria=carga_horaria,
+            carga_horaria_cumprida=_to_int(subject.get('carga_horaria_cumprida')),
+            faltas=faltas,
+            frequencia=_to_float(subject.get('percentual_carga_horaria_frequentada')) or 0.0,
+            nota1=nota1,
+            nota2=nota2,
+            nota3=_nota(subject, 'nota_etapa_3'),
+            nota4=_nota(subject, 'nota_etapa_4'),
+            media=media,
+            nota_final=_nota(subject, 'nota_avaliacao_final'),
+            media_final=_to_float(subject.get('media_final_disciplina')),
+            situacao_suap=situacao,
+            # Aprovado pelo SUAP ou com as duas notas lançadas e média suficiente
+            aprovado=situacao == 'Aprovado' or (
+                nota1 is not None and nota2 is not None and (media or 0) >= MEDIA_APROVACAO
+            ),
+            max_faltas=max_faltas,
+            faltas_restantes=max(0, max_faltas - faltas)
+        )
+
+    @property
+    def situacao(self) -> str:
+        return 'Aprovado' if self.aprovado else 'Cursando'
+
+
+@dataclass(frozen=True, slots=True)
+class Boletim:
+    """Boletim de um período, interpretado uma única vez a partir do JSON do SUAP"""
+    subjects: Tuple[SubjectGrade, ...]
+    total_classes: int
+    total_classes_given: int
+    total_absences: int
+    total_frequency: float
+    approved_subjects: int
+
+    @classmethod
+    def from_api(cls, grades: Optional[List[Dict[str, Any]]]) -> 'Boletim':
+        subjects = tuple(SubjectGrade.from_api(subject) for subject in grades or [] if isinstance(subject, dict))
+
+        total_classes = sum(subject.carga_horaria for subject in subjects)
+        total_classes_given = sum(subject.carga_horaria_cumprida for subject in subjects)
+        total_absences = sum(subject.faltas for subject in subjects)
+        total_frequency = round(
+            ((total_classes_given - total_absences) / total_classes_given) * 100,
+            2
+        ) if total_classes_given > 0 else 0
+
+        return cls(
+            subjects=subjects,
+            total_classes=total_classes,
+            total_classes_given=total_classes_given,
+            total_absences=total_absences,
+            total_frequency=total_frequency,
+            approved_subjects=sum(1 for subject in subjects if subject.aprovado)
+        )
+
+    def __iter__(self):
+        return iter(self.subjects)
+
+    def __len__(self) -> int:
+        return len(self.subjects)
+
+    @property
+    def totals(self) -> Dict[str, Any]:
+        return {
+            'total_classes': self.total_classes,
+            'total_classes_given': self.total_classes_given,
+            'total_absences': self.total_absences,
+            'total_frequency': self.total_frequency
+        }
+
+    @property
+    def summary(self) -> Dict[str, int]:
+        return {
+            'total_subjects': len(self.subjects),
+            'approved_subjects': self.approved_subjects,
+            'at_risk_subjects': len(self.subjects) - self.approved_subjects
+        }
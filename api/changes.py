@@ -0,0 +1,42 @@
+from typing import Any, Dict
+from .boletim import Boletim, SubjectGrade
+
+# Campos da disciplina acompanhados entre duas versões do boletim
+TRACKED_FIELDS = (
+    'nota1', 'nota2', 'nota3', 'nota4', 'media', 'nota_final', 'media_final',
+    'faltas', 'frequencia', 'carga_horaria_cumprida', 'situacao'
+)
+
+
+def _fields(subject: SubjectGrade) -> Dict[str, Any]:
+    return {field: getattr(subject, field) for field in ('carga_horaria',) + TRACKED_FIELDS}
+
+
+def diff_boletins(old: Boletim, new: Boletim) -> Dict[str, Any]:
+    """Mudanças por disciplina entre duas versões do boletim (vazio se nada mudou).
+
+    Cada disciplina alterada traz só os campos que mudaram, com os valores
+    anteriores em ``previous``; disciplinas novas vêm completas. Os totais e o
+    resumo do período acompanham qualquer mudança.
+    """
+    before = {subject.disciplina: subject for subject in old}
+    after = {subject.disciplina: subject for subject in new}
+
+    subjects = []
+    for name, subject in after.items():
+        previous = before.get(name)
+        if previous is None:
+            subjects.append({'disciplina': name, 'added': True, 'fields': _fields(subject)})
+            continue
+        changed = [field for field in TRACKED_FIELDS if getattr(subject, field) != getattr(previous, field)]
+        if changed:
+            subjects.append({
+                'disciplina': name,
+                'fields': {field: getattr(subject, field) for field in changed},
+                'previous': {field: getattr(previous, field) for field in changed},
+            })
+    removed = [name for name in before if name not in after]
+
+    if not subjects and not removed:
+        return {}
+    return {'subjects': subjects, 'removed': removed, 'totals': new.totals, 'summary': new.summary}
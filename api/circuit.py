@@ -0,0 +1,94 @@
+from collections import deque
+from typing import Dict
+import random
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Espera exponencial com jitter completo: aleatória entre 0 e base * 2^tentativa"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Disjuntor de um endpoint do SUAP (fechado/aberto/meio-aberto).
+
+    Guarda o resultado das últimas ``window`` chamadas; quando a taxa de falhas
+    passa de ``failure_rate`` (com pelo menos ``min_calls`` amostras) o circuito
+    abre e as chamadas falham na hora. Depois de um tempo aberto, com espera
+    exponencial e jitter a cada nova abertura, uma única chamada de teste é
+    liberada: se der certo o circuito fecha, senão volta a abrir.
+    """
+
+    def __init__(self, failure_rate: float = 0.5, min_calls: int = 5, window: int = 20,
+                 open_seconds: float = 5, max_open_seconds: float = 60):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._trips = 0
+        self._opened_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Diz se a chamada pode seguir para o SUAP"""
+        if self.state == CLOSED:
+            return True
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() < self._opened_until:
+                    return False
+                self.state = HALF_OPEN
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._outcomes.append(True)
+            if self.state != CLOSED:
+                self.state = CLOSED
+                self._trips = 0
+                self._probing = False
+                self._outcomes.clear()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            if self.state == HALF_OPEN:
+                self._open()
+            elif self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    def _open(self) -> None:
+        open_for = min(self.max_open_seconds, self.open_seconds * (2 ** self._trips))
+        self._opened_until = time.monotonic() + random.uniform(open_for / 2, open_for)
+        self._trips += 1
+        self._probing = False
+        self.state = OPEN
+
+
+class CircuitBreakerRegistry:
+    """Um disjuntor por endpoint, criado na primeira chamada"""
+
+    def __init__(self, **config):
+        self.config = config
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(endpoint, CircuitBreaker(**self.config))
+        return breaker
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from .boletim import Boletim
+
+# Campos somáveis de PeriodStats, dos quais saem as taxas de cada período e do acumulado
+SUM_FIELDS = (
+    'total_subjects', 'approved_subjects', 'total_classes_given',
+    'total_absences', 'grade_sum', 'graded_subjects'
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodStats:
+    """Estatísticas de um período, suficientes para compor o histórico acumulado"""
+    ano: str
+    periodo: str
+    total_subjects: int
+    approved_subjects: int
+    total_classes_given: int
+    total_absences: int
+    grade_sum: float
+    graded_subjects: int
+
+    @classmethod
+    def from_boletim(cls, ano: str, periodo: str, boletim: Boletim) -> 'PeriodStats':
+        medias = [subject.media for subject in boletim if subject.media is not None]
+        return cls(
+            ano=str(ano),
+            periodo=str(periodo),
+            total_subjects=len(boletim),
+            approved_subjects=boletim.approved_subjects,
+            total_classes_given=boletim.total_classes_given,
+            total_absences=boletim.total_absences,
+            grade_sum=sum(medias),
+            graded_subjects=len(medias)
+        )
+
+    @property
+    def key(self) -> str:
+        return f'{self.ano}.{self.periodo}'
+
+    def as_dict(self) -> Dict[str, Any]:
+        return _rates(**{field: getattr(self, field) for field in SUM_FIELDS})
+
+
+def _rates(total_subjects, approved_subjects, total_classes_given, total_absences,
+           grade_sum, graded_subjects) -> Dict[str, Any]:
+    return {
+        'total_subjects': total_subjects,
+        'approved_subjects': approved_subjects,
+        'pass_rate': round(approved_subjects / total_subjects * 100, 2) if total_subjects else 0,
+        'frequency': round(
+            (total_classes_given - total_absences) / total_classes_given * 100, 2
+        ) if total_classes_given else 0,
+        'grade_average': round(grade_sum / graded_subjects, 2) if graded_subjects else None
+    }
+
+
+def build_history(stats: Iterable[PeriodStats]) -> List[Dict[str, Any]]:
+    """Monta o histórico em ordem cronológica, com os totais acumulados até cada período.
+
+    Os acumulados são somas correntes sobre ``PeriodStats``; nenhum boletim
+    precisa ser relido para recalculá-los.
+    """
+    ordered = sorted(stats, key=lambda item: (_sort_key(item.ano), _sort_key(item.periodo)))
+    totals = dict.fromkeys(SUM_FIELDS, 0)
+    previous_average: Optional[float] = None
+    history = []
+
+    for item in ordered:
+        for field in SUM_FIELDS:
+            totals[field] += getattr(item, field)
+        period = item.as_dict()
+        average = period['grade_average']
+        period['grade_trend'] = round(average - previous_average, 2) if (
+            average is not None and previous_average is not None
+        ) else None
+        if average is not None:
+            previous_average = average
+
+        history.append({
+            'ano_letivo': item.ano,
+            'periodo_letivo': item.periodo,
+            'period': period,
+            'cumulative': _rates(**totals)
+        })
+    return history
+
+
+def _sort_key(value: str) -> Tuple[int, str]:
+    return (int(value), '') if str(value).isdigit() else (0, str(value))
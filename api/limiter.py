@@ -0,0 +1,79 @@
+from typing import Dict
+import threading
+import time
+
+
+class SUAPUnavailable(Exception):
+    """O orçamento de chamadas ao SUAP acabou; a requisição deve ser recusada na hora"""
+
+    def __init__(self, message: str, retry_after: float = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Balde de fichas: ``rate`` chamadas por segundo, com rajadas de até ``burst``"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Consome uma ficha e retorna 0, ou retorna quantos segundos faltam para a próxima"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class HostLimiter:
+    """Limita as chamadas a um host do SUAP em concorrência e em taxa.
+
+    Até ``max_concurrent`` chamadas ficam em andamento ao mesmo tempo; uma nova
+    espera no máximo ``acquire_timeout`` segundos por uma vaga. A taxa é
+    controlada por um ``TokenBucket``. Sem vaga ou sem ficha a chamada é
+    recusada com ``SUAPUnavailable`` em vez de entrar na fila.
+    """
+
+    def __init__(self, max_concurrent: int = 20, rate: float = 50, burst: int = 100,
+                 acquire_timeout: float = 0.5, retry_after: float = 5):
+        self.acquire_timeout = acquire_timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._bucket = TokenBucket(rate, burst) if rate else None
+
+    def acquire(self, host: str) -> None:
+        """Reserva uma vaga para uma chamada; cada ``acquire`` exige um ``release``"""
+        if self._bucket is not None:
+            wait = self._bucket.try_acquire()
+            if wait:
+                raise SUAPUnavailable(f"Limite de chamadas por segundo ao SUAP atingido ({host})", max(1, wait))
+        if self._slots is not None and not self._slots.acquire(timeout=self.acquire_timeout):
+            raise SUAPUnavailable(f"Limite de chamadas simultâneas ao SUAP atingido ({host})", self.retry_after)
+
+    def release(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
+
+
+class HostLimiterRegistry:
+    """Um limitador por host, criado na primeira chamada"""
+
+    def __init__(self, **config):
+        self.config = config
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> HostLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(host, HostLimiter(**self.config))
+        return limiter
@@ -0,0 +1,108 @@
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+import contextvars
+import threading
+
+# Limites (em segundos) dos buckets do histograma de latência do SUAP
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Chamadas ao SUAP feitas durante a requisição atual: (endpoint, segundos)
+_timings: contextvars.ContextVar = contextvars.ContextVar('suap_timings', default=None)
+
+
+class Metrics:
+    """Contadores e histogramas do processo, expostos no formato texto do Prometheus.
+
+    Cada worker tem os seus; o Prometheus soma as séries ao agregar as instâncias.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: Dict[str, List[int]] = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+        self._latency_sum: Dict[str, float] = defaultdict(float)
+        self._requests: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._cache: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._snapshots: Dict[str, int] = defaultdict(int)
+
+    def observe_request(self, endpoint: str, seconds: float, outcome: str) -> None:
+        """Registra uma chamada ao SUAP (outcome: ok, client_error, error)"""
+        with self._lock:
+            self._latency[endpoint][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self._latency_sum[endpoint] += seconds
+            self._requests[(endpoint, outcome)] += 1
+        timings = _timings.get()
+        if timings is not None:
+            timings.append((endpoint, seconds))
+
+    def count_request(self, endpoint: str, outcome: str) -> None:
+        """Registra uma chamada que não chegou ao SUAP (ex.: circuito aberto)"""
+        with self._lock:
+            self._requests[(endpoint, outcome)] += 1
+
+    def count_cache(self, endpoint: str, result: str) -> None:
+        """Registra uma leitura do cache (result: hit, stale, miss)"""
+        with self._lock:
+            self._cache[(endpoint, result)] += 1
+
+    def count_snapshot(self, endpoint: str) -> None:
+        """Registra uma cópia carregada do banco; a leitura em si já conta em ``count_cache``"""
+        with self._lock:
+            self._snapshots[endpoint] += 1
+
+    def render(self) -> str:
+        with self._lock:
+            latency = {endpoint: list(counts) for endpoint, counts in self._latency.items()}
+            latency_sum = dict(self._latency_sum)
+            requests = dict(self._requests)
+            cache = dict(self._cache)
+            snapshots = dict(self._snapshots)
+
+        lines = [
+            '# HELP suap_request_duration_seconds Duração das chamadas ao SUAP.',
+            '# TYPE suap_request_duration_seconds histogram',
+        ]
+        for endpoint, counts in sorted(latency.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'suap_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+            lines.append(f'suap_request_duration_seconds_sum{{endpoint="{endpoint}"}} {latency_sum[endpoint]:.6f}')
+            lines.append(f'suap_request_duration_seconds_count{{endpoint="{endpoint}"}} {cumulative}')
+
+        lines += [
+            '# HELP suap_requests_total Chamadas ao SUAP por resultado.',
+            '# TYPE suap_requests_total counter',
+        ]
+        for (endpoint, outcome), count in sorted(requests.items()):
+            lines.append(f'suap_requests_total{{endpoint="{endpoint}",outcome="{outcome}"}} {count}')
+
+        lines += [
+            '# HELP suap_cache_total Leituras do cache de respostas do SUAP por resultado.',
+            '# TYPE suap_cache_total counter',
+        ]
+        for (endpoint, result), count in sorted(cache.items()):
+            lines.append(f'suap_cache_total{{endpoint="{endpoint}",result="{result}"}} {count}')
+
+        lines += [
+            '# HELP suap_snapshot_loads_total Entradas do cache recuperadas das cópias no banco.',
+            '# TYPE suap_snapshot_loads_total counter',
+        ]
+        for endpoint, count in sorted(snapshots.items()):
+            lines.append(f'suap_snapshot_loads_total{{endpoint="{endpoint}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def track_timings() -> Iterator[List[Tuple[str, float]]]:
+    """Coleta as chamadas ao SUAP feitas dentro do bloco, inclusive em outras threads e tarefas"""
+    timings: List[Tuple[str, float]] = []
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
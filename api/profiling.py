@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+from functools import wraps
+from typing import Iterator, List
+import contextvars
+import cProfile
+import threading
+
+# Perfis das threads de I/O coletados para a requisição sendo perfilada
+_thread_profiles: contextvars.ContextVar = contextvars.ContextVar('suap_thread_profiles', default=None)
+_local = threading.local()
+
+
+@contextmanager
+def track_thread_profiles() -> Iterator[List[cProfile.Profile]]:
+    """Coleta os perfis das funções marcadas com ``profiled`` que rodarem dentro do bloco.
+
+    O cProfile só enxerga a thread em que foi ligado; nas views assíncronas o
+    trabalho pesado (chamadas ao SUAP, interpretação do boletim) roda em
+    threads do ``sync_to_async``, que herdam o contexto e entram na lista.
+    """
+    profiles: List[cProfile.Profile] = []
+    token = _thread_profiles.set(profiles)
+    try:
+        yield profiles
+    finally:
+        _thread_profiles.reset(token)
+
+
+def profiled(func):
+    """Roda ``func`` sob um cProfile desta thread quando há um ``track_thread_profiles`` ativo"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        profiles = _thread_profiles.get()
+        if profiles is None or getattr(_local, 'active', False):
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        _local.active = True
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            _local.active = False
+            profiles.append(profiler)
+    return wrapper
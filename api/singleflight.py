@@ -0,0 +1,90 @@
+from typing import Any, Callable, Dict
+import logging
+import threading
+import time
+
+logger = logging.getLogger('portal_estudante')
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Agrupa chamadas idênticas e simultâneas em uma única execução.
+
+    A primeira thread a pedir uma chave executa a função; as que chegarem
+    enquanto ela estiver em andamento esperam e recebem o mesmo resultado.
+    """
+
+    def __init__(self, wait_timeout: float = 30):
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.event.wait(self.wait_timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            # A chamada original demorou demais: segue por conta própria
+            logger.warning(f"Tempo de espera esgotado aguardando chamada em andamento para {key}")
+            return func()
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+
+class SharedSingleFlight:
+    """Coalescência entre workers usando o backend de cache compartilhado.
+
+    Quem consegue criar a trava (``cache.add`` é atômico nos backends
+    compartilhados, como Redis e memcached) busca no SUAP; os demais
+    consultam ``poll`` até o valor aparecer no cache, por no máximo
+    ``wait_timeout`` segundos.
+    """
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, cache, lock_timeout: float = 30, wait_timeout: float = 30):
+        self.cache = cache
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+
+    def do(self, key: str, func: Callable[[], Any], poll: Callable[[], Any] = None) -> Any:
+        poll = poll or (lambda: self.cache.get(key))
+        lock_key = f"{key}:lock"
+        if self.cache.add(lock_key, 1, self.lock_timeout):
+            try:
+                return func()
+            finally:
+                self.cache.delete(lock_key)
+
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            value = poll()
+            if value is not None:
+                return value
+            if self.cache.get(lock_key) is None:
+                break  # O outro worker terminou sem guardar nada (ex.: erro no SUAP)
+        return func()
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Iterable, List, Sequence, Tuple
+import math
+from .boletim import Boletim, SubjectGrade, MEDIA_APROVACAO
+
+MEDIA_FINAL = 40  # Média mínima para ter direito à prova final
+NOTA_MAXIMA = 100
+
+# Pesos das etapas na média de cada tipo de curso
+PESOS = {
+    'superior': (2, 3),
+    'tecnico': (2, 2, 3, 3),
+}
+
+
+def detect_course(boletim: Boletim, curso: str = '') -> str:
+    """Curso técnico (4 etapas) pelo nome do curso ou por notas lançadas na 3ª/4ª etapa"""
+    nome = str(curso or '').lower()
+    if 'técnico' in nome or 'tecnico' in nome:
+        return 'tecnico'
+    if any(subject.nota3 is not None or subject.nota4 is not None for subject in boletim):
+        return 'tecnico'
+    return 'superior'
+
+
+def _ceil(value: float) -> float:
+    """Arredonda para cima na primeira casa decimal, para a nota nunca ficar abaixo do necessário"""
+    return math.ceil(round(value * 10, 6)) / 10
+
+
+def _required(value: float) -> Optional[float]:
+    """Nota exigida limitada à escala: 0 se já está garantido, None se é impossível"""
+    if value > NOTA_MAXIMA:
+        return None
+    return max(0.0, _ceil(value))
+
+
+@dataclass(frozen=True, slots=True)
+class _Row:
+    """Uma disciplina reduzida ao que o solver precisa, montada uma vez por boletim"""
+    disciplina: str
+    notas: Tuple[Optional[float], ...]
+    faltas: int
+    max_faltas: float
+
+    @classmethod
+    def from_subject(cls, subject: SubjectGrade, etapas: int) -> '_Row':
+        notas = (subject.nota1, subject.nota2, subject.nota3, subject.nota4)[:etapas]
+        return cls(subject.disciplina, notas, subject.faltas, subject.max_faltas)
+
+
+def _solve(notas: Sequence[Optional[float]], pesos: Sequence[int]) -> Dict[str, Any]:
+    """Nota mínima nas etapas que faltam e na prova final para uma combinação de notas"""
+    total = sum(pesos)
+    known = sum(peso * nota for peso, nota in zip(pesos, notas) if nota is not None)
+    missing = [index for index, nota in enumerate(notas) if nota is None]
+
+    if missing:
+        # Todas as etapas que faltam com a mesma nota x: known + x * peso_restante >= 60 * total
+        remaining = sum(pesos[index] for index in missing)
+        needed = _required((MEDIA_APROVACAO * total - known) / remaining)
+        situacao = 'Aprovado' if needed == 0 else 'Cursando'
+        if needed is None:
+            # Sem chance de média 60, mas ainda pode alcançar 40 e ir para a prova final
+            needed = _required((MEDIA_FINAL * total - known) / remaining)
+            situacao = 'Reprovado' if needed is None else 'Prova Final'
+        return {
+            'media': None,
+            'proxima_etapa': missing[0] + 1,
+            'nota_necessaria': needed,
+            'nota_final_necessaria': None,
+            'situacao': situacao,
+        }
+
+    media = known / total
+    if media >= MEDIA_APROVACAO:
+        situacao, final = 'Aprovado', None
+    elif media < MEDIA_FINAL:
+        situacao, final = 'Reprovado', None
+    else:
+        # A final vale a melhor opção: média com a média parcial ou substituir uma das etapas
+        options = [MEDIA_APROVACAO * 2 - media]
+        for index, peso in enumerate(pesos):
+            options.append((MEDIA_APROVACAO * total - (known - peso * notas[index])) / peso)
+        final = _required(min(options))
+        situacao = 'Prova Final' if final is not None else 'Reprovado'
+    return {
+        'media': round(media, 2),
+        'proxima_etapa': None,
+        'nota_necessaria': None,
+        'nota_final_necessaria': final,
+        'situacao': situacao,
+    }
+
+
+class GradeSolver:
+    """Calcula "quanto preciso tirar" para todas as disciplinas de um boletim de uma vez.
+
+    As disciplinas são reduzidas uma única vez; cada cenário só substitui as
+    notas e faltas que informar, e a resposta traz uma linha por disciplina
+    para cada cenário, na ordem em que foram pedidos.
+    """
+
+    def __init__(self, boletim: Boletim, curso: str = 'superior'):
+        if curso not in PESOS:
+            raise ValueError(f'Tipo de curso inválido: {curso}')
+        self.curso = curso
+        self.pesos = PESOS[curso]
+        self.rows = [_Row.from_subject(subject, len(self.pesos)) for subject in boletim]
+
+    def _row(self, row: _Row, override: Dict[str, Any]) -> Dict[str, Any]:
+        notas = tuple(
+            _override_grade(override, f'nota{index + 1}', nota) for index, nota in enumerate(row.notas)
+        )
+        faltas = int(override.get('faltas', row.faltas))
+        return {
+            'disciplina': row.disciplina,
+            **_solve(notas, self.pesos),
+            'faltas': faltas,
+            'faltas_restantes': max(0, math.floor(row.max_faltas - faltas)),
+            'reprovado_por_faltas': faltas > row.max_faltas,
+        }
+
+    def solve(self, scenarios: Iterable[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+        """Resolve o boletim atual e cada cenário (``{'nome': ..., 'disciplinas': {nome: {...}}}``)"""
+        results = []
+        for index, scenario in enumerate([{'nome': 'atual'}, *scenarios]):
+            overrides = scenario.get('disciplinas') or {}
+            results.append({
+                'nome': scenario.get('nome') or f'cenario-{index}',
+                'disciplinas': [self._row(row, overrides.get(row.disciplina) or {}) for row in self.rows],
+            })
+        return results
+
+
+def _override_grade(override: Dict[str, Any], field: str, current: Optional[float]) -> Optional[float]:
+    if field not in override:
+        return current
+    value = override[field]
+    return None if value is None else min(NOTA_MAXIMA, max(0.0, float(value)))
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator
+import contextvars
+
+# Endpoint -> instante (epoch) da cópia vencida que foi servida no contexto atual
+_stale_marker: contextvars.ContextVar = contextvars.ContextVar('suap_stale_marker', default=None)
+
+
+@contextmanager
+def track_stale() -> Iterator[Dict[str, float]]:
+    """Registra as respostas do SUAP servidas a partir de cópias vencidas.
+
+    O dicionário produzido é compartilhado com as tarefas e threads disparadas
+    dentro do bloco; ao sair, o que foi registrado também é repassado para um
+    ``track_stale`` mais externo, se houver.
+    """
+    outer = _stale_marker.get()
+    marker: Dict[str, float] = {}
+    token = _stale_marker.set(marker)
+    try:
+        yield marker
+    finally:
+        _stale_marker.reset(token)
+        if outer is not None:
+            for endpoint, fetched_at in marker.items():
+                mark_stale(endpoint, fetched_at, outer)
+
+
+def mark_stale(endpoint: str, fetched_at: float, marker: Dict[str, float] = None) -> None:
+    marker = _stale_marker.get() if marker is None else marker
+    if marker is not None:
+        marker[endpoint] = min(fetched_at, marker.get(endpoint, fetched_at))
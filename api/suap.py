@@ -1,13 +1,41 @@
 import requests
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
 from typing import Optional, Dict, Any, List
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+import hashlib
 import logging
+import re
+import threading
 import time
 from requests.exceptions import RequestException, Timeout
+from .circuit import CircuitBreakerRegistry, backoff_delay
+from .limiter import HostLimiterRegistry, SUAPUnavailable
+from .metrics import metrics
+from .profiling import profiled
+from .singleflight import SingleFlight, SharedSingleFlight
+from .stale import mark_stale
 
 logger = logging.getLogger('portal_estudante')
 
+
+class SUAPClientError(Exception):
+    """O SUAP recusou a chamada com um 4xx (ex.: token expirado ou revogado).
+
+    O SUAP está respondendo, então não é falha: não há nova tentativa e a
+    última cópia boa do cache não é servida no lugar da resposta.
+    """
+
+    def __init__(self, url: str, status_code: int):
+        super().__init__(f"SUAP respondeu {status_code} para {url}")
+        self.status_code = status_code
+
+
 class SUAPAPI:
     AUTHORIZATION_URL = settings.SUAP['AUTH_URL']
     ACCESS_TOKEN_URL = settings.SUAP['TOKEN_URL']
@@ -19,35 +47,290 @@ class SUAPAPI:
     DEFAULT_SCOPE = ['identificacao', 'email', 'documentos_pessoais']
     MAX_RETRIES = 3
     TIMEOUT = 10
+    CACHE_PREFIX = 'suap'
+    DEFAULT_CACHE_TTL = 300
+    TOKEN_SCOPED_ENDPOINTS = ('user_data',)
+    MAX_PENDING_REFRESHES = 100
 
-    def __init__(self):
+    def __init__(self, pool_size: int = None, keep_alive: bool = None):
         self.client_id = settings.SUAP['CLIENT_ID']
         self.client_secret = settings.SUAP['CLIENT_SECRET']
-        self.access_token = None
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.pool_size = pool_size or settings.SUAP.get('POOL_SIZE', 10)
+        self.keep_alive = settings.SUAP.get('KEEP_ALIVE', True) if keep_alive is None else keep_alive
+        self.cache = caches[settings.SUAP.get('CACHE_ALIAS', 'default')]
+        self.cache_ttl = settings.SUAP.get('CACHE_TTL', {})
+        self.stale_while_revalidate = settings.SUAP.get('STALE_WHILE_REVALIDATE', 0)
+        self.stale_if_error = settings.SUAP.get('STALE_IF_ERROR', 0)
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=settings.SUAP.get('REFRESH_WORKERS', 2),
+            thread_name_prefix='suap-refresh'
+        )
+        # Consultas independentes de uma mesma busca (ex.: rh/eu/ e meus-dados/) rodam em paralelo
+        self._fetch_executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='suap-fetch')
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+        self.backoff_base = settings.SUAP.get('BACKOFF_BASE', 0.2)
+        self.backoff_max = settings.SUAP.get('BACKOFF_MAX', 2)
+        self._breakers = CircuitBreakerRegistry(**settings.SUAP.get('CIRCUIT_BREAKER', {}))
+        self._limiters = HostLimiterRegistry(**settings.SUAP.get('RATE_LIMIT', {}))
+        snapshots = settings.SUAP.get('SNAPSHOTS', {})
+        self.snapshots = import_string(snapshots['STORE'])() if snapshots.get('STORE') else None
+        self.snapshot_endpoints = frozenset(snapshots.get('ENDPOINTS', ()))
+        wait_timeout = self.TIMEOUT * self.MAX_RETRIES
+        self._flight = SingleFlight(wait_timeout)
+        # Coalescência entre workers só faz sentido com um backend compartilhado (ex.: Redis)
+        self._shared_flight = SharedSingleFlight(
+            self.cache, wait_timeout, wait_timeout
+        ) if settings.SUAP.get('SHARED_SINGLE_FLIGHT', False) else None
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        """Cria a sessão HTTP com pool de conexões, compartilhável entre threads"""
+        session = requests.Session()
+        # A sessão é compartilhada por todos os usuários: cookies devolvidos
+        # pelo SUAP nunca podem ser reaproveitados em outra requisição
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=0  # Os retries são tratados em _make_request
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
             'User-Agent': 'PortalDoAluno/1.0',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Connection': 'keep-alive' if self.keep_alive else 'close'
         })
+        return session
+
+    @staticmethod
+    def _auth_headers(access_token: str) -> Dict[str, str]:
+        return {'Authorization': f'Bearer {access_token}'}
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.sha256(str(value).encode()).hexdigest()[:32]
+
+    def _identity(self, access_token: str) -> str:
+        """Identifica o dono do token para compor as chaves de cache.
+
+        Depois que ``rh/eu/`` é consultado o token fica associado à matrícula,
+        então tokens diferentes do mesmo aluno compartilham as mesmas entradas.
+        """
+        token_key = self._hash(access_token)
+        key = f"{self.CACHE_PREFIX}:identity:{token_key}"
+        identity = self.cache.get(key)
+        if identity is None:
+            entry = self._load_snapshot(key, 'identity')
+            if entry is not None:
+                identity = entry[1]
+                self.cache.set(key, identity, self.cache_ttl.get('identity', 86400))
+        return identity or token_key
+
+    def _remember_identity(self, access_token: str, user_data: Dict[str, Any]) -> None:
+        registration = user_data.get('identificacao') or user_data.get('matricula')
+        if not registration:
+            return
+
+        token_key = self._hash(access_token)
+        identity = self._hash(registration)
+        key = f"{self.CACHE_PREFIX}:identity:{token_key}"
+        self.cache.set(key, identity, self.cache_ttl.get('identity', 86400))
+        self._save_snapshot(key, 'identity', (time.time(), identity))
+        # Respostas que chegaram antes da identidade ser conhecida (ex.: os
+        # períodos buscados em paralelo no login) passam para a chave do aluno
+        for endpoint in ('periods',):
+            entry = self.cache.get(f"{self.CACHE_PREFIX}:{endpoint}:{token_key}")
+            if entry is not None:
+                key = f"{self.CACHE_PREFIX}:{endpoint}:{identity}"
+                self.cache.set(key, entry, self._storage_timeout(endpoint))
+                self._save_snapshot(key, endpoint, entry)
+
+    def _cache_key(self, endpoint: str, access_token: str, *params) -> str:
+        # Os dados do usuário são o que revela a identidade, então ficam presos ao token
+        owner = self._hash(access_token) if endpoint in self.TOKEN_SCOPED_ENDPOINTS else self._identity(access_token)
+        return ':'.join([self.CACHE_PREFIX, endpoint, owner, *map(str, params)])
+
+    def _ttl(self, endpoint: str) -> int:
+        return self.cache_ttl.get(endpoint, self.DEFAULT_CACHE_TTL)
+
+    def _storage_timeout(self, endpoint: str) -> int:
+        # A entrada continua no cache depois de vencer, para ser servida enquanto
+        # é renovada ou quando o SUAP falhar
+        return self._ttl(endpoint) + max(self.stale_while_revalidate, self.stale_if_error)
+
+    def _store(self, key: str, endpoint: str, value: Any) -> Any:
+        if value and self._ttl(endpoint):
+            entry = (time.time(), value)
+            self.cache.set(key, entry, self._storage_timeout(endpoint))
+            self._save_snapshot(key, endpoint, entry)
+        return value
+
+    def _load_snapshot(self, key: str, endpoint: str) -> Optional[tuple]:
+        """Cópia durável de uma entrada que não está no cache (ex.: instância recém-criada)"""
+        if self.snapshots is None or endpoint not in self.snapshot_endpoints:
+            return None
+        entry = self.snapshots.get(key)
+        if entry is None:
+            return None
+        remaining = self._storage_timeout(endpoint) - (time.time() - entry[0])
+        if remaining <= 0:
+            return None
+        metrics.count_snapshot(endpoint)
+        return entry
+
+    def _save_snapshot(self, key: str, endpoint: str, entry: tuple) -> None:
+        if self.snapshots is not None and endpoint in self.snapshot_endpoints:
+            self.snapshots.set(key, *entry)
+
+    def _fresh(self, key: str, endpoint: str) -> Any:
+        entry = self.cache.get(key)
+        if entry and time.time() - entry[0] <= self._ttl(endpoint):
+            return entry[1]
+        return None
+
+    def _cached(self, endpoint: str, access_token: str, params: tuple, fetch) -> Any:
+        """Lê do cache compartilhado e, na falta, busca no SUAP e guarda o resultado.
+
+        Pedidos simultâneos pela mesma chave esperam uma única ida ao SUAP. Uma
+        cópia pouco vencida é servida na hora enquanto é renovada em segundo
+        plano, e a última cópia boa é servida quando o SUAP falha (timeout,
+        5xx, circuito aberto ou sem orçamento), nunca quando ele recusa o
+        pedido com um 4xx. Sem entrada
+        no cache, a cópia durável do banco (``SNAPSHOTS``) é consultada antes.
+        """
+        key = self._cache_key(endpoint, access_token, *params)
+        entry = self.cache.get(key)
+        if not entry:
+            entry = self._load_snapshot(key, endpoint)
+            if entry:
+                # A cópia do banco aquece o cache desta instância
+                self.cache.set(key, entry, self._storage_timeout(endpoint) - (time.time() - entry[0]))
+        if entry:
+            fetched_at, value = entry
+            age = time.time() - fetched_at
+            if age <= self._ttl(endpoint):
+                metrics.count_cache(endpoint, 'hit')
+                return value
+            if age <= self._ttl(endpoint) + self.stale_while_revalidate:
+                metrics.count_cache(endpoint, 'stale')
+                mark_stale(endpoint, fetched_at)
+                self._refresh_in_background(key, endpoint, fetch)
+                return value
+
+        metrics.count_cache(endpoint, 'miss')
+        try:
+            value = self._flight.do(key, lambda: self._fetch_once(key, endpoint, fetch))
+        except SUAPClientError as e:
+            # Token expirado ou revogado: a view precisa saber, não recebe cópia antiga
+            logger.warning(f"SUAP recusou {endpoint}: {str(e)}")
+            return None
+        except SUAPUnavailable:
+            if not entry:
+                raise
+            value = None
+        if value is None and entry:
+            logger.warning(f"SUAP indisponível para {endpoint}, servindo a última cópia válida")
+            mark_stale(endpoint, entry[0])
+            return entry[1]
+        return value
+
+    def _fetch_once(self, key: str, endpoint: str, fetch) -> Any:
+        # Outra thread pode ter guardado o valor entre a leitura e a trava
+        value = self._fresh(key, endpoint)
+        if value is not None:
+            return value
+        if self._shared_flight:
+            return self._shared_flight.do(
+                key,
+                lambda: self._store(key, endpoint, fetch()),
+                poll=lambda: self._fresh(key, endpoint)
+            )
+        return self._store(key, endpoint, fetch())
+
+    def _refresh_in_background(self, key: str, endpoint: str, fetch) -> None:
+        """Renova uma entrada vencida no pool limitado de threads de atualização"""
+        with self._refreshing_lock:
+            if key in self._refreshing or len(self._refreshing) >= self.MAX_PENDING_REFRESHES:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._flight.do(key, lambda: self._fetch_once(key, endpoint, fetch))
+            except Exception as e:
+                logger.error(f"Erro ao atualizar {endpoint} em segundo plano: {str(e)}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_executor.submit(refresh)
+
+    @staticmethod
+    def _endpoint_name(url: str) -> str:
+        # Ano, período e matrícula viram curingas: o disjuntor é por endpoint, não por recurso
+        path = urlsplit(url).path
+        return re.sub(r'/\d[^/]*', '/*', path)
 
     def _make_request(self, method: str, url: str, **kwargs) -> Optional[Dict]:
-        """Método auxiliar para fazer requisições com retry e tratamento de erros"""
-        retries = 0
-        while retries < self.MAX_RETRIES:
+        """Método auxiliar para fazer requisições com retry e tratamento de erros.
+
+        Cada endpoint tem um disjuntor: com o SUAP fora do ar as chamadas falham
+        na hora, sem prender a thread em novas tentativas. Só timeouts, erros de
+        conexão e respostas 5xx contam como falha e são repetidos; respostas
+        4xx lançam ``SUAPClientError``.
+
+        Toda chamada, inclusive as novas tentativas, passa pelo limitador do
+        host antes do disjuntor; sem orçamento sobrando é lançado
+        ``SUAPUnavailable``, que vira uma resposta 503 com Retry-After.
+        """
+        endpoint = self._endpoint_name(url)
+        breaker = self._breakers.get(endpoint)
+        host = urlsplit(url).netloc
+        limiter = self._limiters.get(host)
+        kwargs.setdefault('timeout', self.TIMEOUT)
+
+        for attempt in range(self.MAX_RETRIES):
+            # O limitador vem antes do disjuntor: uma chamada recusada por falta de
+            # orçamento não pode ficar com a vaga de teste do circuito meio-aberto
+            try:
+                limiter.acquire(host)
+            except SUAPUnavailable:
+                metrics.count_request(endpoint, 'rate_limited')
+                raise
+            if not breaker.allow():
+                limiter.release()
+                logger.debug(f"Circuito aberto para {endpoint}, chamada ignorada")
+                metrics.count_request(endpoint, 'circuit_open')
+                return None
+            started = time.perf_counter()
             try:
-                kwargs.setdefault('timeout', self.TIMEOUT)
                 response = self.session.request(method, url, **kwargs)
                 response.raise_for_status()
-                return response.json()
+                data = response.json()
+                metrics.observe_request(endpoint, time.perf_counter() - started, 'ok')
+                breaker.record_success()
+                return data
             except Timeout:
-                logger.warning(f"Timeout ao acessar {url}. Tentativa {retries + 1} de {self.MAX_RETRIES}")
+                logger.warning(f"Timeout ao acessar {url}. Tentativa {attempt + 1} de {self.MAX_RETRIES}")
             except RequestException as e:
                 logger.error(f"Erro ao acessar {url}: {str(e)}")
                 if hasattr(e.response, 'text'):
                     logger.error(f"Resposta do servidor: {e.response.text}")
-            retries += 1
-            if retries < self.MAX_RETRIES:
-                time.sleep(1)  # Espera 1 segundo antes de tentar novamente
+                if e.response is not None and e.response.status_code < 500:
+                    # Erro do cliente (ex.: token expirado): o SUAP está respondendo
+                    metrics.observe_request(endpoint, time.perf_counter() - started, 'client_error')
+                    breaker.record_success()
+                    raise SUAPClientError(url, e.response.status_code)
+            except ValueError:
+                logger.error(f"Resposta inválida de {url}")
+            finally:
+                limiter.release()
+            metrics.observe_request(endpoint, time.perf_counter() - started, 'error')
+            breaker.record_failure()
+            if attempt + 1 < self.MAX_RETRIES:
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
         return None
 
     def get_authorization_url(self, redirect_uri: str, state: str = None) -> str:
@@ -73,132 +356,175 @@ class SUAPAPI:
             'grant_type': 'authorization_code'
         }
         
-        result = self._make_request('POST', self.ACCESS_TOKEN_URL, data=data)
+        try:
+            result = self._make_request('POST', self.ACCESS_TOKEN_URL, data=data)
+        except SUAPClientError:
+            return None  # Código de autorização inválido ou já usado
         if result:
-            self.access_token = result.get('access_token')
-            return self.access_token
+            return result.get('access_token')
         return None
 
-    def get_user_data(self, access_token: str = None) -> Optional[Dict[str, Any]]:
+    def get_user_data(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Busca os dados do usuário autenticado"""
-        token = access_token or self.access_token
-        if not token:
+        if not access_token:
             logger.error("Token de acesso não fornecido")
             return None
         
-        headers = {'Authorization': f'Bearer {token}'}
+        return self._cached('user_data', access_token, (), lambda: self._fetch_user_data(access_token))
+
+    def _fetch_user_data(self, access_token: str) -> Optional[Dict[str, Any]]:
+        headers = self._auth_headers(access_token)
         
-        # Busca dados básicos do usuário
+        # Dados extras (curso) em paralelo com os dados básicos do usuário
+        extra = self._fetch_executor.submit(self._make_request, 'GET', self.EXTRA_USER_DATA_URL, headers=headers)
         user_data = self._make_request('GET', self.USER_DATA_URL, headers=headers)
         if not user_data:
             return None
+        try:
+            extra_data = extra.result()
+        except SUAPClientError:
+            extra_data = None  # Sem vínculo de aluno, o curso apenas fica de fora
             
-        # Busca dados extras do usuário
-        extra_data = self._make_request('GET', self.EXTRA_USER_DATA_URL, headers=headers)
         if extra_data and 'vinculo' in extra_data and 'curso' in extra_data['vinculo']:
             user_data['curso'] = extra_data['vinculo']['curso']
         
+        self._remember_identity(access_token, user_data)
         return user_data
 
-    def get_user_grades(self, ano_letivo: str = None, periodo_letivo: str = None) -> Optional[Dict[str, Any]]:
+    def get_user_grades(self, access_token: str, ano_letivo: str = None, periodo_letivo: str = None) -> Optional[Dict[str, Any]]:
         """Busca notas do usuário autenticado"""
-        if not self.access_token:
+        if not access_token:
             return None
         
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        
-        if ano_letivo and periodo_letivo:
-            url = f"{self.API_URL}v2/minhas-informacoes/boletim/{ano_letivo}/{periodo_letivo}/"
-        else:
+        if not (ano_letivo and periodo_letivo):
             # Tenta buscar notas do período atual
-            periods = self.get_academic_periods()
-            if periods and len(periods) > 0:
-                # Usa o período mais recente
-                current_period = periods[0]
-                ano = current_period.get('ano_letivo', current_period.get('ano'))
-                periodo = current_period.get('periodo_letivo', current_period.get('periodo'))
-                url = f"{self.API_URL}v2/minhas-informacoes/boletim/{ano}/{periodo}/"
-            else:
-                #logger.error("Não foi possível encontrar períodos acadêmicos")
+            periods = self.get_academic_periods(access_token)
+            if not periods:
                 return None
+            # Usa o período mais recente
+            current_period = periods[0]
+            ano_letivo = current_period.get('ano_letivo', current_period.get('ano'))
+            periodo_letivo = current_period.get('periodo_letivo', current_period.get('periodo'))
         
-        try:
-            #logger.debug(f"Buscando notas do URL: {url}")
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            #logger.error(f"Erro ao buscar notas: {e}")
-            #if hasattr(e.response, 'text'):
-                #logger.error(f"Conteúdo da resposta: {e.response.text}")
-            return None
+        url = f"{self.API_URL}v2/minhas-informacoes/boletim/{ano_letivo}/{periodo_letivo}/"
+        return self._cached(
+            'boletim', access_token, (ano_letivo, periodo_letivo),
+            lambda: self._make_request('GET', url, headers=self._auth_headers(access_token))
+        )
 
-    def get_academic_periods(self) -> Optional[List[Dict[str, Any]]]:
+    def get_academic_periods(self, access_token: str) -> Optional[List[Dict[str, Any]]]:
         """Pega a lista de períodos acadêmicos tentando ambos os endpoints disponíveis"""
-        if not self.access_token:
+        if not access_token:
             return None
         
-        headers = {"Authorization": f"Bearer {self.access_token}"}
+        return self._cached('periods', access_token, (), lambda: self._fetch_academic_periods(access_token))
 
+    def _fetch_academic_periods(self, access_token: str) -> Optional[List[Dict[str, Any]]]:
+        headers = self._auth_headers(access_token)
         try:
-            response = requests.get(self.PERIODS_URL_2, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            if data:  # Se obtiver dados válidos, retorna-os
-                return data
-        except requests.exceptions.RequestException:
-            pass
-        
-        try:
-            response = requests.get(self.PERIODS_URL_1, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return None
+            data = self._make_request('GET', self.PERIODS_URL_2, headers=headers)
+        except SUAPClientError as e:
+            if e.status_code in (401, 403):
+                raise
+            data = None  # Endpoint indisponível nesta instalação do SUAP: tenta o antigo
+        if data:  # Se obtiver dados válidos, retorna-os
+            return data
+        return self._make_request('GET', self.PERIODS_URL_1, headers=headers)
 
-    def get_student_data(self, registration: str) -> Optional[Dict[str, Any]]:
+    def get_student_data(self, access_token: str, registration: str) -> Optional[Dict[str, Any]]:
         """Pega os dados do estudante"""
-        if not self.access_token:
+        if not access_token:
             return None
         
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         url = f"{self.API_URL}edu/alunos/{registration}/"
-        
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            #logger.error(f"Erro ao buscar dados do estudante: {e}")
-            return None
+        return self._cached(
+            'student_data', access_token, (registration,),
+            lambda: self._make_request('GET', url, headers=self._auth_headers(access_token))
+        )
 
-    def get_student_grades(self, registration: str) -> Optional[Dict[str, Any]]:
+    def get_student_grades(self, access_token: str, registration: str) -> Optional[Dict[str, Any]]:
         """Pega as notas do estudante"""
-        if not self.access_token:
+        if not access_token:
             return None
         
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         url = f"{self.API_URL}edu/alunos/{registration}/boletim/"
-        
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            #logger.error(f"Erro ao buscar notas do estudante: {e}")
-            return None
+        return self._cached(
+            'student_grades', access_token, (registration,),
+            lambda: self._make_request('GET', url, headers=self._auth_headers(access_token))
+        )
 
-    def get_diaries(self, semestre: str) -> Optional[List[Dict[str, Any]]]:
+    def get_diaries(self, access_token: str, semestre: str) -> Optional[List[Dict[str, Any]]]:
         """Busca os diários e disciplinas do semestre"""
-        if not self.access_token:
+        if not access_token:
             return None
         
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         url = f"{self.API_URL}v2/minhas-informacoes/meus-diarios/{semestre}/"
-        
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return None 
\ No newline at end of file
+        return self._cached(
+            'diaries', access_token, (semestre,),
+            lambda: self._make_request('GET', url, headers=self._auth_headers(access_token))
+        )
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> SUAPAPI:
+    """Retorna o cliente SUAP compartilhado por todas as threads do processo"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SUAPAPI()
+    return _client
+
+
+class AsyncSUAPAPI:
+    """Contraparte assíncrona do SUAPAPI, com a mesma interface.
+
+    Cada requisição roda no pool de conexões do cliente síncrono em uma thread
+    de I/O, então chamadas independentes disparadas com ``asyncio.gather``
+    acontecem em paralelo e ainda reaproveitam as conexões já abertas.
+    """
+
+    def __init__(self, client: SUAPAPI = None):
+        self.client = client or get_client()
+
+    def _run(self, func, *args, **kwargs):
+        return sync_to_async(profiled(func), thread_sensitive=False)(*args, **kwargs)
+
+    def get_authorization_url(self, redirect_uri: str, state: str = None) -> str:
+        """Gera a URL de autorização para o fluxo OAuth2"""
+        return self.client.get_authorization_url(redirect_uri, state)
+
+    async def get_token_from_code(self, code: str, redirect_uri: str) -> Optional[str]:
+        """Troca o código de autorização por um token de acesso"""
+        return await self._run(self.client.get_token_from_code, code, redirect_uri)
+
+    async def get_user_data(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """Busca os dados do usuário autenticado"""
+        return await self._run(self.client.get_user_data, access_token)
+
+    async def get_user_grades(self, access_token: str, ano_letivo: str = None, periodo_letivo: str = None) -> Optional[Dict[str, Any]]:
+        """Busca notas do usuário autenticado"""
+        return await self._run(self.client.get_user_grades, access_token, ano_letivo, periodo_letivo)
+
+    async def get_academic_periods(self, access_token: str) -> Optional[List[Dict[str, Any]]]:
+        """Pega a lista de períodos acadêmicos tentando ambos os endpoints disponíveis"""
+        return await self._run(self.client.get_academic_periods, access_token)
+
+    async def get_student_data(self, access_token: str, registration: str) -> Optional[Dict[str, Any]]:
+        """Pega os dados do estudante"""
+        return await self._run(self.client.get_student_data, access_token, registration)
+
+    async def get_student_grades(self, access_token: str, registration: str) -> Optional[Dict[str, Any]]:
+        """Pega as notas do estudante"""
+        return await self._run(self.client.get_student_grades, access_token, registration)
+
+    async def get_diaries(self, access_token: str, semestre: str) -> Optional[List[Dict[str, Any]]]:
+        """Busca os diários e disciplinas do semestre"""
+        return await self._run(self.client.get_diaries, access_token, semestre)
+
+
+def get_async_client() -> AsyncSUAPAPI:
+    """Retorna um cliente assíncrono apoiado no cliente compartilhado do processo"""
+    return AsyncSUAPAPI(get_client())
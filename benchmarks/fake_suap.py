@@ -0,0 +1,155 @@
+"""Servidor HTTP local que imita a API do SUAP, para benchmarks sem rede.
+
+Serve ``rh/eu/``, ``meus-dados/``, ``meus-periodos-letivos/``,
+``boletim/{ano}/{periodo}/``, ``meus-diarios/{semestre}/`` e o endpoint de
+token com dados sintéticos determinísticos. A latência e a taxa de falhas
+(respostas 500) são configuráveis e podem ser alteradas com o servidor no ar.
+"""
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import Counter
+import json
+import random
+import re
+import threading
+import time
+
+REGISTRATION = '20231234567'
+
+
+def _subjects(ano: int, periodo: int, count: int):
+    rng = random.Random(f'{ano}.{periodo}')
+    subjects = []
+    for index in range(count):
+        nota1 = rng.randint(30, 100)
+        nota2 = rng.randint(30, 100) if rng.random() < 0.7 else None
+        media = round((nota1 * 2 + nota2 * 3) / 5) if nota2 is not None else None
+        faltas = rng.randint(0, 20)
+        subjects.append({
+            'codigo_diario': str(10000 + index),
+            'disciplina': f'TEC.{index:04d} - Disciplina {index} ({ano}.{periodo})',
+            'carga_horaria': 60,
+            'carga_horaria_cumprida': 40,
+            'numero_faltas': faltas,
+            'percentual_carga_horaria_frequentada': round((40 - faltas) / 40 * 100, 1),
+            'situacao': 'Aprovado' if media is not None and media >= 60 else 'Cursando',
+            'media_disciplina': media,
+            'nota_avaliacao_final': {'nota': None, 'faltas': 0},
+            'media_final_disciplina': None,
+            'nota_etapa_1': {'nota': nota1, 'faltas': 0},
+            'nota_etapa_2': {'nota': nota2, 'faltas': 0},
+            'nota_etapa_3': {'nota': None, 'faltas': 0},
+            'nota_etapa_4': {'nota': None, 'faltas': 0},
+        })
+    return subjects
+
+
+class FakeSUAP:
+    """SUAP falso rodando em uma thread do próprio processo.
+
+    ``calls`` conta as requisições recebidas por endpoint, para medir quantas
+    idas ao SUAP cada página custa.
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, failure_rate: float = 0.0,
+                 periods: int = 4, subjects: int = 8):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.periods = periods
+        self.subjects = subjects
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_port}/'
+
+    def start(self) -> 'FakeSUAP':
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def total_calls(self) -> int:
+        with self._lock:
+            return sum(self.calls.values())
+
+    def _record(self, endpoint: str) -> None:
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    def academic_periods(self):
+        year, period = 2025, 1
+        result = []
+        for _ in range(self.periods):
+            result.append({'ano_letivo': year, 'periodo_letivo': period})
+            year, period = (year, 1) if period == 2 else (year - 1, 2)
+        return result
+
+    def _route(self, method: str, path: str):
+        if method == 'POST':
+            return 'token', {'access_token': 'fake-token', 'token_type': 'Bearer'}
+        if path.endswith('/rh/eu/'):
+            return 'rh/eu', {
+                'identificacao': REGISTRATION,
+                'matricula': REGISTRATION,
+                'nome_usual': 'Aluno Teste',
+                'nome': 'Aluno de Teste',
+                'nome_registro': 'Aluno de Teste da Silva',
+                'email': 'aluno@example.com',
+                'campus': 'CNAT',
+            }
+        if path.endswith('/meus-dados/'):
+            return 'meus-dados', {'vinculo': {'curso': 'Tecnologia em Análise e Desenvolvimento de Sistemas'}}
+        if path.endswith('/meus-periodos-letivos/'):
+            return 'meus-periodos-letivos', self.academic_periods()
+        match = re.search(r'/boletim/(\d+)/(\d+)/$', path)
+        if match:
+            return 'boletim', _subjects(int(match[1]), int(match[2]), self.subjects)
+        match = re.search(r'/meus-diarios/(\d+)/(\d+)/$', path)
+        if match:
+            subjects = _subjects(int(match[1]), int(match[2]), self.subjects)
+            return 'meus-diarios', [{
+                'id': index,
+                'disciplina': {'nome': subject['disciplina'], 'ch_total_aula': 80}
+            } for index, subject in enumerate(subjects)]
+        return None, None
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _respond(self, method: str):
+                endpoint, payload = fake._route(method, self.path.split('?')[0])
+                fake._record(endpoint or 'not-found')
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if endpoint is None:
+                    status, payload = 404, {'detail': 'Não encontrado.'}
+                elif fake.failure_rate and random.random() < fake.failure_rate:
+                    status, payload = 500, {'detail': 'Erro interno.'}
+                else:
+                    status = 200
+
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                if self.headers.get('Content-Length'):
+                    self.rfile.read(int(self.headers['Content-Length']))
+                self._respond('POST')
+
+        return Handler
@@ -0,0 +1,85 @@
+"""Mede o tempo de importação do app, como no cold start da função na Vercel.
+
+Executa ``python -X importtime`` em um processo novo, importando o ponto de
+entrada WSGI e as URLs (que carregam as views), e mostra os módulos mais
+caros. Falha se algum módulo proibido for importado na inicialização ou se
+o tempo total passar do limite.
+
+Uso:
+    python benchmarks/importtime.py
+    python benchmarks/importtime.py --top 20 --max-ms 600 --forbid reportlab
+"""
+from pathlib import Path
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRYPOINT = 'import portal.wsgi; import portal.urls'
+FORBIDDEN = ('reportlab',)
+
+# Valores mínimos para o settings carregar fora da Vercel
+DEFAULT_ENV = {
+    'DJANGO_SETTINGS_MODULE': 'portal.settings',
+    'SECRET_KEY': 'benchmark',
+    'SUAP_CLIENT_ID': 'benchmark',
+    'SUAP_CLIENT_SECRET': 'benchmark',
+    'SUAP_AUTH_URL': 'http://localhost/o/authorize/',
+    'SUAP_TOKEN_URL': 'http://localhost/o/token/',
+    'SUAP_API_URL': 'http://localhost/api/',
+}
+
+
+def measure():
+    """Retorna [(módulo, self_us, cumulativo_us, profundidade)] de um processo novo"""
+    env = {**DEFAULT_ENV, **os.environ}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', ENTRYPOINT],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"Falha ao importar o app:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=15, help='quantos módulos mostrar')
+    parser.add_argument('--max-ms', type=float, help='falha se o total passar deste valor')
+    parser.add_argument('--forbid', nargs='*', default=FORBIDDEN,
+                        help='pacotes que não podem ser importados na inicialização')
+    args = parser.parse_args()
+
+    modules = measure()
+    # Os módulos de nível zero somam o tempo total de importação
+    total_ms = sum(cumulative for _name, _self, cumulative, depth in modules if depth == 0) / 1000
+
+    print(f"{'cumulativo (ms)':>16} {'próprio (ms)':>13}  módulo")
+    for name, self_us, cumulative_us, _depth in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:16.1f} {self_us / 1000:13.1f}  {name}")
+    print(f"\nTotal: {total_ms:.1f} ms em {len(modules)} módulos")
+
+    failures = []
+    imported = {name.split('.')[0] for name, *_rest in modules}
+    for package in args.forbid:
+        if package in imported:
+            failures.append(f"{package} foi importado na inicialização")
+    if args.max_ms is not None and total_ms > args.max_ms:
+        failures.append(f"tempo total {total_ms:.1f} ms acima do limite de {args.max_ms:.1f} ms")
+
+    for failure in failures:
+        print(f"ERRO: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Benchmark das views do portal contra um SUAP falso local.
+
+Faz o login pelo fluxo OAuth completo e mede, para cada página, a latência
+com o cache vazio (frio) e nas repetições seguintes (quente), quantas
+requisições cada página faz ao SUAP e quantos bytes de sessão são gravados.
+
+Uso:
+    python benchmarks/views.py
+    python benchmarks/views.py --latency 0.2 --iterations 20 --periods 8
+    python benchmarks/views.py --failure-rate 0.3 --json resultado.json
+"""
+from pathlib import Path
+from statistics import median, quantiles
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fake_suap import FakeSUAP  # noqa: E402
+
+XHR = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+
+def pages(ano: int, periodo: int):
+    """(nome, caminho, cabeçalhos) de cada página medida"""
+    query = f'?ano={ano}&periodo={periodo}'
+    return [
+        ('dashboard', f'/dashboard/{query}', {}),
+        ('dashboard (xhr)', f'/dashboard/{query}', XHR),
+        ('report', f'/report/{query}', {}),
+        ('report (xhr)', f'/report/{query}', XHR),
+        ('simulator', f'/simulator/{query}', {}),
+        ('simulator (xhr)', f'/simulator/{query}', XHR),
+        ('history', '/history/', {}),
+        ('period-data', f'/period-data/{query}', XHR),
+        ('export pdf', f'/export/pdf/{query}', {}),
+        ('export csv', f'/export/csv/{query}', {}),
+        ('export csv (todos)', '/export/csv/?todos=1', {}),
+    ]
+
+
+def setup_django(fake: FakeSUAP, session_engine: str):
+    defaults = {
+        'DJANGO_SETTINGS_MODULE': 'portal.settings',
+        'SECRET_KEY': 'benchmark',
+        'DEBUG': 'True',
+        'ALLOWED_HOSTS': 'testserver,localhost',
+        'SUAP_CLIENT_ID': 'benchmark',
+        'SUAP_CLIENT_SECRET': 'benchmark',
+    }
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+    # O SUAP sempre aponta para o servidor falso
+    os.environ['SUAP_AUTH_URL'] = f'{fake.url}o/authorize/'
+    os.environ['SUAP_TOKEN_URL'] = f'{fake.url}o/token/'
+    os.environ['SUAP_API_URL'] = f'{fake.url}api/'
+
+    import django
+    from django.conf import settings
+    django.setup()
+
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    settings.SESSION_ENGINE = session_engine
+    settings.SESSION_FILE_PATH = tempfile.mkdtemp(prefix='portal-bench-sessions-')
+    settings.SESSION_COOKIE_SECURE = False
+
+    if session_engine.endswith('.db') or session_engine.endswith('cached_db'):
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0, interactive=False)
+
+
+def instrument_sessions(written: list):
+    """Registra o tamanho de cada sessão gravada pelo backend configurado"""
+    from django.conf import settings
+    from importlib import import_module
+
+    store_class = import_module(settings.SESSION_ENGINE).SessionStore
+    original_save = store_class.save
+
+    def save(self, *args, **kwargs):
+        result = original_save(self, *args, **kwargs)
+        # As engines do portal pulam a gravação quando a sessão não mudou
+        if not getattr(self, 'skipped_save', False):
+            written.append(len(self.encode(self._get_session(no_load=kwargs.get('must_create', False)))))
+        return result
+
+    store_class.save = save
+
+
+def login(client):
+    from urllib.parse import urlparse, parse_qs
+
+    response = client.get('/login/?auth=suap')
+    state = parse_qs(urlparse(response['Location']).query)['state'][0]
+    response = client.get(f'/oauth/callback/?code=benchmark&state={state}')
+    if response.status_code != 302:
+        sys.exit(f'Falha no login: {response.status_code} {response.content[:200]!r}')
+
+
+def request(client, fake, written, path, headers):
+    calls_before = fake.total_calls()
+    sessions_before = len(written)
+    started = time.perf_counter()
+    response = client.get(path, **headers)
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    elapsed = (time.perf_counter() - started) * 1000
+    return {
+        'status': response.status_code,
+        'ms': elapsed,
+        'calls': fake.total_calls() - calls_before,
+        'session_bytes': sum(written[sessions_before:]),
+        'bytes': len(body),
+    }
+
+
+def clear_caches():
+    from django.core.cache import caches
+    for cache in caches.all():
+        cache.clear()
+
+
+def run(args):
+    fake = FakeSUAP(latency=args.latency, failure_rate=0.0, periods=args.periods, subjects=args.subjects).start()
+    setup_django(fake, args.session_engine)
+    written = []
+    instrument_sessions(written)
+
+    from django.test import Client
+
+    ano, periodo = fake.academic_periods()[0].values()
+
+    results = []
+    for name, path, headers in pages(ano, periodo):
+        clear_caches()
+        fake.failure_rate = 0.0
+        client = Client()
+        login(client)
+        # A injeção de falhas vale só para as medições, não para o login
+        fake.failure_rate = args.failure_rate
+        cold = request(client, fake, written, path, headers)
+        warm = [request(client, fake, written, path, headers) for _ in range(args.iterations)]
+        warm_ms = [sample['ms'] for sample in warm]
+        results.append({
+            'page': name,
+            'path': path,
+            'status': cold['status'],
+            'cold_ms': round(cold['ms'], 2),
+            'cold_calls': cold['calls'],
+            'warm_p50_ms': round(median(warm_ms), 2),
+            'warm_p95_ms': round(quantiles(warm_ms, n=20)[-1], 2) if len(warm_ms) > 1 else round(warm_ms[0], 2),
+            'warm_calls': round(sum(sample['calls'] for sample in warm) / len(warm), 2),
+            'session_bytes': max(sample['session_bytes'] for sample in [cold] + warm),
+            'response_bytes': cold['bytes'],
+        })
+
+    fake.stop()
+    return results
+
+
+def print_table(results):
+    columns = [
+        ('page', 'página', 20), ('status', 'status', 6), ('cold_ms', 'frio ms', 9),
+        ('cold_calls', 'idas', 5), ('warm_p50_ms', 'p50 ms', 8), ('warm_p95_ms', 'p95 ms', 8),
+        ('warm_calls', 'idas', 5), ('session_bytes', 'sessão B', 9), ('response_bytes', 'resposta B', 10),
+    ]
+    print('  '.join(f'{title:>{width}}' if index else f'{title:<{width}}'
+                    for index, (_key, title, width) in enumerate(columns)))
+    for row in results:
+        print('  '.join(f'{row[key]:>{width}}' if index else f'{row[key]:<{width}}'
+                        for index, (key, _title, width) in enumerate(columns)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10, help='repetições com o cache quente')
+    parser.add_argument('--latency', type=float, default=0.05, help='latência do SUAP falso, em segundos')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fração de respostas 500 do SUAP falso')
+    parser.add_argument('--periods', type=int, default=4, help='períodos letivos do aluno')
+    parser.add_argument('--subjects', type=int, default=8, help='disciplinas por período')
+    parser.add_argument('--session-engine', default='portal_estudante.sessions.file',
+                        help='backend de sessão (o padrão é o usado na Vercel)')
+    parser.add_argument('--json', help='grava os resultados neste arquivo')
+    args = parser.parse_args()
+
+    results = run(args)
+    print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
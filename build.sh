@@ -8,10 +8,10 @@ sleep 10
 
 echo "Testing database connection..."
 python << END
-import psycopg2
+import psycopg
 import os
 try:
-    conn = psycopg2.connect(
+    conn = psycopg.connect(
         dbname="postgres",
         user="postgres.cqjczoluecxuaqxjwdkn",
         password=os.getenv('DB_PASSWORD'),
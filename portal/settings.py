@@ -49,12 +49,15 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Necessário em produção
+    'portal_estudante.middleware.ServerTimingMiddleware',
+    'portal_estudante.middleware.SUAPUnavailableMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'portal_estudante.middleware.ProfilingMiddleware',  # Fica por último: envolve só a view
 ]
 
 ROOT_URLCONF = 'portal.urls'
@@ -89,14 +92,17 @@ DATABASES = {
     }
 }
 
-# Configuração de Sessões
+# Configuração de Sessões (engines que só regravam a sessão quando o conteúdo muda)
 if os.getenv('VERCEL', False):
     # Em produção (Vercel), usa o diretório /tmp
-    SESSION_ENGINE = 'django.contrib.sessions.backends.file'
+    SESSION_ENGINE = 'portal_estudante.sessions.file'
     SESSION_FILE_PATH = '/tmp'
 else:
     # Em desenvolvimento, usa o banco de dados
-    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    SESSION_ENGINE = 'portal_estudante.sessions.db'
+# Sessões pequenas (só token e identidade) também cabem em um cookie assinado, sem
+# nenhuma E/S no servidor: SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies
+SESSION_ENGINE = os.getenv('SESSION_ENGINE', SESSION_ENGINE)
 
 # Se DATABASE_URL estiver definida, usa PostgreSQL (produção)
 # Configurado para uso com Supabase e Vercel
@@ -117,9 +123,29 @@ if os.getenv('DATABASE_URL'):
             'keepalives_count': 5,
         },
         'CONN_MAX_AGE': 0,
+        # Testa a conexão antes de usá-la; com o pool do psycopg 3 é o check de cada empréstimo
+        'CONN_HEALTH_CHECKS': True,
+        # Views que não usam o banco ficam fora da transação com @transaction.non_atomic_requests
         'ATOMIC_REQUESTS': True,
         'DISABLE_SERVER_SIDE_CURSORS': True,
     }
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        # psycopg2: sem pool, a conexão é reaproveitada entre requisições
+        DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+    else:
+        # psycopg 3: pool de conexões por instância. O pooler do Supabase (porta 6543) opera
+        # em modo transação e não aceita prepared statements, por isso prepare_threshold=None
+        DATABASES['default']['OPTIONS'].update({
+            'prepare_threshold': None,
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '4')),
+                'timeout': 10,
+                'max_idle': 60,
+            },
+        })
 
 
 # Validação de senha
@@ -178,6 +204,99 @@ SUAP = {
     'AUTH_URL': os.getenv('SUAP_AUTH_URL'),
     'TOKEN_URL': os.getenv('SUAP_TOKEN_URL'),
     'API_URL': os.getenv('SUAP_API_URL'),
+    # Pool de conexões HTTP compartilhado entre as threads de cada worker
+    'POOL_SIZE': int(os.getenv('SUAP_POOL_SIZE', '10')),
+    'KEEP_ALIVE': os.getenv('SUAP_KEEP_ALIVE', 'True') == 'True',
+    # Cache compartilhado das respostas (alias em CACHES) e validade por endpoint, em segundos
+    'CACHE_ALIAS': 'suap',
+    'CACHE_TTL': {
+        'identity': 86400,
+        'user_data': 3600,
+        'periods': 3600,
+        'boletim': int(os.getenv('SUAP_CACHE_TTL_BOLETIM', '300')),
+        'diaries': 1800,
+        'student_data': 3600,
+        'student_grades': int(os.getenv('SUAP_CACHE_TTL_BOLETIM', '300')),
+    },
+    # Pedidos idênticos simultâneos já são agrupados em cada worker; com um cache
+    # compartilhado (Redis) o agrupamento pode valer também entre workers
+    'SHARED_SINGLE_FLIGHT': os.getenv('SUAP_SHARED_SINGLE_FLIGHT', 'False') == 'True',
+    # Depois do TTL a cópia ainda é servida por STALE_WHILE_REVALIDATE segundos enquanto
+    # é renovada em segundo plano, e por até STALE_IF_ERROR segundos se o SUAP falhar
+    'STALE_WHILE_REVALIDATE': int(os.getenv('SUAP_STALE_WHILE_REVALIDATE', '600')),
+    'STALE_IF_ERROR': int(os.getenv('SUAP_STALE_IF_ERROR', '86400')),
+    'REFRESH_WORKERS': int(os.getenv('SUAP_REFRESH_WORKERS', '2')),
+    # Novas tentativas esperam entre 0 e BACKOFF_BASE * 2^tentativa segundos (limitado a BACKOFF_MAX)
+    'BACKOFF_BASE': float(os.getenv('SUAP_BACKOFF_BASE', '0.2')),
+    'BACKOFF_MAX': float(os.getenv('SUAP_BACKOFF_MAX', '2')),
+    # Disjuntor por endpoint: abre quando FAILURE_RATE das últimas WINDOW chamadas falham
+    'CIRCUIT_BREAKER': {
+        'failure_rate': float(os.getenv('SUAP_CIRCUIT_FAILURE_RATE', '0.5')),
+        'min_calls': 5,
+        'window': 20,
+        'open_seconds': float(os.getenv('SUAP_CIRCUIT_OPEN_SECONDS', '5')),
+        'max_open_seconds': 60,
+    },
+    # Limite por host do SUAP: chamadas simultâneas por worker e taxa (fichas por segundo,
+    # com rajadas de até BURST). Sem orçamento a requisição recebe 503 com Retry-After
+    'RATE_LIMIT': {
+        'max_concurrent': int(os.getenv('SUAP_MAX_CONCURRENT', '20')),
+        'rate': float(os.getenv('SUAP_RATE_LIMIT', '50')),
+        'burst': int(os.getenv('SUAP_RATE_BURST', '100')),
+        'acquire_timeout': float(os.getenv('SUAP_ACQUIRE_TIMEOUT', '0.5')),
+        'retry_after': 5,
+    },
+    # Cópias duráveis das respostas no banco (tabela SUAPSnapshot), para que uma instância
+    # nova da função já comece com o cache quente. Ativadas por padrão com o PostgreSQL
+    'SNAPSHOTS': {
+        'STORE': os.getenv(
+            'SUAP_SNAPSHOT_STORE',
+            'portal_estudante.store.SnapshotStore' if os.getenv('DATABASE_URL') else ''
+        ),
+        'ENDPOINTS': ('identity', 'periods', 'boletim', 'diaries'),
+    },
+}
+
+# Dados por período de cada aluno ficam fora da sessão, com limite de tamanho e descarte LRU
+STUDENT_STORE = {
+    'CACHE_ALIAS': 'suap',
+    'MAX_ENTRIES': 12,
+    'MAX_BYTES': 256 * 1024,
+    'ENTRY_TTL': SUAP['CACHE_TTL']['boletim'],  # Não sobrevive ao boletim de onde foi derivado
+}
+
+# Canal SSE de mudanças no boletim (/events/grades/), só disponível sob ASGI (portal/asgi.py).
+# Um watcher por aluno e período consulta o boletim a cada POLL_INTERVAL segundos, para
+# qualquer número de abas; cada conexão dura até MAX_DURATION segundos e o navegador reconecta
+EVENTS = {
+    'POLL_INTERVAL': int(os.getenv('EVENTS_POLL_INTERVAL', '60')),
+    'KEEPALIVE': 15,
+    'MAX_DURATION': int(os.getenv('EVENTS_MAX_DURATION', '300')),
+    'RETRY': 10,
+}
+
+# Token exigido pelo endpoint /metrics/ (formato Prometheus); sem ele o endpoint fica desativado
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Profiling sob demanda: só requisições com o token de `manage.py profiling_token`
+PROFILING = {
+    'ENABLED': os.getenv('PROFILING_ENABLED', 'False') == 'True',
+    'SAMPLE_RATE': float(os.getenv('PROFILING_SAMPLE_RATE', '1.0')),
+    'DIRECTORY': os.getenv('PROFILING_DIRECTORY', '/tmp/portal-profiles'),
+    'FORMAT': os.getenv('PROFILING_FORMAT', 'pstats'),  # pstats ou collapsed
+    'TOKEN_MAX_AGE': 3600,
+}
+
+# Estatísticas dos períodos encerrados, usadas pelo histórico acadêmico
+HISTORY_STORE = {
+    'CACHE_ALIAS': 'suap',
+    'TIMEOUT': 30 * 86400,
+}
+
+# PDFs do boletim já gerados, indexados pelo hash do conteúdo
+PDF_CACHE = {
+    'CACHE_ALIAS': 'suap',
+    'TIMEOUT': 3600,
 }
 
 SESSION_COOKIE_AGE = 3600  # 1 hora em segundos
@@ -185,10 +304,18 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = False # Mantém a sessão ativa mesmo após o
 SESSION_COOKIE_SECURE = True  # Requer HTTPS
 SESSION_COOKIE_HTTPONLY = True  # Previne acesso via JavaScript
 SESSION_SAVE_EVERY_REQUEST = True  # Atualiza o cookie de sessão a cada requisição
+SESSION_TOUCH_INTERVAL = 300  # Sessão sem mudanças tem a validade renovada no servidor no máximo a cada 5 min
 
-# Configurações de Cache para Sessões
+# Configurações de Cache
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    },
+    # Respostas do SUAP compartilhadas entre sessões. Aceita qualquer backend
+    # do Django, ex.: SUAP_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+    # com SUAP_CACHE_LOCATION=redis://localhost:6379/0
+    'suap': {
+        'BACKEND': os.getenv('SUAP_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('SUAP_CACHE_LOCATION', 'suap'),
+    },
 } 
\ No newline at end of file
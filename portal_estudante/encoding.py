@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Any, Optional
+from django.core.serializers.json import DjangoJSONEncoder
+import gzip
+import json
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Respostas menores que isso não compensam o custo de comprimir
+MIN_COMPRESS_BYTES = 200
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Bem mais rápido que o padrão (11) e quase tão compacto para JSON pequeno
+
+_django_default = DjangoJSONEncoder().default
+
+
+def dumps(data: Any) -> bytes:
+    """Serializa em JSON compacto, com o orjson quando disponível"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_django_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # Ex.: inteiros maiores que 64 bits, que só o json da biblioteca padrão aceita
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def accepted_encodings(header: str) -> set:
+    """Codificações do Accept-Encoding com q > 0"""
+    accepted = set()
+    for item in (header or '').split(','):
+        name, _sep, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _sep, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip() and quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def negotiate(header: str, size: int) -> Optional[str]:
+    """Escolhe br (se o pacote brotli estiver instalado) ou gzip, ou None para não comprimir"""
+    if size < MIN_COMPRESS_BYTES:
+        return None
+    accepted = accepted_encodings(header)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+class _CompressedCache:
+    """Versões comprimidas das últimas respostas, pela chave (ETag, codificação).
+
+    O mesmo conteúdo costuma ser pedido de novo (outra aba, outro aparelho,
+    cache do navegador limpo); assim ele é comprimido uma vez só por worker.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, encoding: str, body: bytes) -> bytes:
+        key = (etag, encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                return compressed
+
+        compressed = compress(body, encoding)
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime fixo: o mesmo conteúdo sempre gera os mesmos bytes
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+compressed_cache = _CompressedCache()
@@ -0,0 +1,86 @@
+from typing import Dict, Set, Tuple
+from django.conf import settings
+from api import get_async_client, Boletim, SUAPUnavailable
+from api.changes import diff_boletins
+import asyncio
+import logging
+
+logger = logging.getLogger('portal_estudante')
+
+
+class GradeWatcher:
+    """Acompanha o boletim de um aluno em um período e avisa as abas abertas do que mudou.
+
+    Existe um watcher por aluno e período em cada worker, não importa quantas
+    abas estejam abertas: uma única tarefa consulta o SUAP a cada
+    ``POLL_INTERVAL`` segundos (pelo cache do cliente, então o SUAP em si é
+    consultado no máximo uma vez por TTL do boletim) e entrega as diferenças na
+    fila de cada inscrito. A tarefa termina sozinha quando a última aba sai.
+    """
+    QUEUE_SIZE = 16
+
+    def __init__(self, key: Tuple[str, str, str], boletim: Boletim, access_token: str):
+        self.key = key
+        self.boletim = boletim
+        self.access_token = access_token
+        self.interval = settings.EVENTS.get('POLL_INTERVAL', 60)
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.task = None
+
+    def subscribe(self, access_token: str) -> asyncio.Queue:
+        # O token mais recente é usado nas próximas consultas
+        self.access_token = access_token
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    def publish(self, delta: dict) -> None:
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(delta)
+            except asyncio.QueueFull:
+                logger.warning(f"Fila de eventos cheia, mudança descartada para uma aba de {self.key[1:]}")
+
+    async def poll(self) -> None:
+        _student, ano, periodo = self.key
+        grades = await get_async_client().get_user_grades(self.access_token, ano, periodo)
+        if grades is None:
+            return
+        boletim = Boletim.from_api(grades)
+        delta = diff_boletins(self.boletim, boletim)
+        if delta:
+            self.boletim = boletim
+            self.publish(delta)
+
+    async def run(self) -> None:
+        try:
+            while self.subscribers:
+                await asyncio.sleep(self.interval)
+                if not self.subscribers:
+                    break
+                try:
+                    await self.poll()
+                except SUAPUnavailable:
+                    pass  # SUAP sobrecarregado: tenta de novo no próximo ciclo
+                except Exception as e:
+                    logger.error(f"Erro ao verificar mudanças no boletim: {str(e)}")
+        finally:
+            if _watchers.get(self.key) is self and not self.subscribers:
+                del _watchers[self.key]
+
+
+_watchers: Dict[Tuple[str, str, str], GradeWatcher] = {}
+
+
+def watch(student: str, ano: str, periodo: str, boletim: Boletim, access_token: str) -> Tuple[GradeWatcher, asyncio.Queue]:
+    """Inscreve uma aba no watcher do aluno e período, criando-o se preciso"""
+    key = (student, str(ano), str(periodo))
+    watcher = _watchers.get(key)
+    if watcher is None:
+        watcher = _watchers[key] = GradeWatcher(key, boletim, access_token)
+    return watcher, watcher.subscribe(access_token)
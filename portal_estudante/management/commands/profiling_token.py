@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from portal_estudante.middleware import profiling_token
+
+
+class Command(BaseCommand):
+    help = 'Gera um token assinado para o profiling de requisições (cabeçalho X-Profile ou ?_profile=)'
+
+    def handle(self, *args, **options):
+        max_age = settings.PROFILING.get('TOKEN_MAX_AGE', 3600)
+        self.stdout.write(profiling_token())
+        self.stderr.write(f'Válido por {max_age} segundos.')
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from portal_estudante.store import SnapshotStore
+
+
+class Command(BaseCommand):
+    help = 'Apaga as cópias do SUAP guardadas no banco que já não podem mais ser servidas'
+
+    def add_arguments(self, parser):
+        default = max(settings.SUAP['CACHE_TTL'].values()) + max(
+            settings.SUAP.get('STALE_WHILE_REVALIDATE', 0), settings.SUAP.get('STALE_IF_ERROR', 0)
+        )
+        parser.add_argument('--max-age', type=int, default=default, help='idade máxima, em segundos')
+
+    def handle(self, *args, **options):
+        deleted = SnapshotStore().prune(options['max_age'])
+        self.stdout.write(f'{deleted} snapshots apagados.')
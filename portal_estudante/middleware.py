@@ -0,0 +1,220 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction
+from collections import defaultdict
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.utils.deprecation import MiddlewareMixin
+from pathlib import Path
+from api import track_timings, track_thread_profiles, SUAPUnavailable
+import cProfile
+import logging
+import math
+import pstats
+import random
+import threading
+import time
+
+logger = logging.getLogger('portal_estudante')
+
+PROFILING_SALT = 'portal_estudante.profiling'
+MIN_STACK_SECONDS = 1e-5
+
+
+class ServerTimingMiddleware:
+    """Adiciona o cabeçalho Server-Timing com as chamadas ao SUAP feitas pela view.
+
+    Cada endpoint do SUAP aparece uma vez, com o tempo somado e o número de
+    chamadas; ``app`` é o tempo total da requisição no Django.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with track_timings() as timings:
+            response = self.get_response(request)
+        return self.add_header(response, timings, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with track_timings() as timings:
+            response = await self.get_response(request)
+        return self.add_header(response, timings, started)
+
+    @staticmethod
+    def add_header(response, timings, started):
+        totals = defaultdict(lambda: [0.0, 0])
+        for endpoint, seconds in list(timings):
+            totals[endpoint][0] += seconds
+            totals[endpoint][1] += 1
+
+        entries = [
+            f'suap;desc="{endpoint} ({count}x)";dur={seconds * 1000:.1f}'
+            for endpoint, (seconds, count) in totals.items()
+        ]
+        entries.append(f'app;dur={(time.perf_counter() - started) * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(entries)
+        return response
+
+
+class SUAPUnavailableMiddleware(MiddlewareMixin):
+    """Responde 503 com Retry-After quando a view esbarra no limite de chamadas ao SUAP.
+
+    A requisição é recusada na hora, em vez de esperar na fila de um SUAP já
+    sobrecarregado; o navegador (ou o fetch do front-end) tenta de novo depois.
+    """
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, SUAPUnavailable):
+            return None
+        logger.warning(f"Requisição recusada em {request.path}: {exception}")
+        message = 'O SUAP está sobrecarregado no momento. Tente novamente em alguns segundos.'
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            response = JsonResponse({'error': message}, status=503)
+        else:
+            response = render(request, '503.html', {'message': message}, status=503)
+        response['Retry-After'] = str(math.ceil(exception.retry_after))
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+def profiling_token() -> str:
+    """Token assinado que libera o profiling de uma requisição (cabeçalho X-Profile ou ?_profile=)"""
+    return signing.dumps('profile', salt=PROFILING_SALT)
+
+
+def collapsed_stacks(stats: pstats.Stats):
+    """Converte as estatísticas do cProfile em pilhas colapsadas para flame graphs.
+
+    O cProfile guarda apenas as arestas chamador -> chamado, então o tempo de
+    cada função é repartido entre as pilhas na proporção de cada chamada.
+    """
+    children = defaultdict(dict)
+    roots = []
+    for func, (_cc, _nc, _tt, _ct, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            children[caller][func] = edge[3]
+
+    def label(func):
+        filename, line, name = func
+        return f'{name} ({Path(filename).name}:{line})'.replace(';', ',')
+
+    def visit(func, stack, ratio):
+        tt, ct = stats.stats[func][2], stats.stats[func][3]
+        if ct * ratio < MIN_STACK_SECONDS:
+            return  # Ramos irrelevantes são podados, senão o número de caminhos explode
+        stack = stack + [label(func)]
+        if tt * ratio >= MIN_STACK_SECONDS:
+            yield ';'.join(stack), tt * ratio
+        if len(stack) > 128:
+            return
+        for child, edge_ct in children[func].items():
+            child_ct = stats.stats[child][3]
+            if child_ct and label(child) not in stack:
+                yield from visit(child, stack, ratio * edge_ct / child_ct)
+
+    totals = defaultdict(float)
+    for root in roots:
+        for stack, seconds in visit(root, [], 1.0):
+            totals[stack] += seconds
+    # Amostras em microssegundos, como esperado pelo flamegraph.pl e pelo speedscope
+    return [f'{stack} {round(seconds * 1e6)}' for stack, seconds in totals.items()]
+
+
+class ProfilingMiddleware:
+    """Executa a view sob o cProfile quando a requisição traz um token assinado.
+
+    Desativado por padrão: sem ``PROFILING['ENABLED']`` o Django descarta o
+    middleware na inicialização e não há custo nenhum por requisição. Com ele
+    ativo, só requisições com um token válido (ver ``profiling_token``) entram
+    no sorteio de ``SAMPLE_RATE``; o resultado vai para ``DIRECTORY`` como
+    ``.pstats`` ou pilhas colapsadas, com o nome da view no arquivo.
+
+    Nas views assíncronas o perfil junta a thread do event loop com as threads
+    de I/O que rodaram funções marcadas com ``api.profiled`` (chamadas ao SUAP
+    e ``load_boletim``). Só uma requisição é perfilada por vez em cada worker:
+    duas no mesmo event loop disputariam o mesmo gancho do cProfile.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'PROFILING', {})
+        if not config.get('ENABLED'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config.get('SAMPLE_RATE', 1.0)
+        self.token_max_age = config.get('TOKEN_MAX_AGE', 3600)
+        self.output_format = config.get('FORMAT', 'pstats')
+        self.directory = Path(config.get('DIRECTORY', '/tmp/portal-profiles'))
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def should_profile(self, request) -> bool:
+        token = request.headers.get('X-Profile') or request.GET.get('_profile')
+        if not token:
+            return False
+        try:
+            signing.loads(token, salt=PROFILING_SALT, max_age=self.token_max_age)
+        except signing.BadSignature:
+            logger.warning("Token de profiling inválido ou expirado")
+            return False
+        return random.random() < self.sample_rate
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.should_profile(request):
+            return None
+        if not self._lock.acquire(blocking=False):
+            logger.info("Outra requisição já está sendo perfilada, esta segue sem profiling")
+            return None
+
+        try:
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            with track_thread_profiles() as thread_profiles:
+                if iscoroutinefunction(view_func):
+                    # O perfil é ligado dentro da corrotina, na thread do event loop que a executa
+                    async def run():
+                        profiler.enable()
+                        try:
+                            return await view_func(request, *view_args, **view_kwargs)
+                        finally:
+                            profiler.disable()
+                    response = async_to_sync(run)()
+                else:
+                    profiler.enable()
+                    try:
+                        response = view_func(request, *view_args, **view_kwargs)
+                    finally:
+                        profiler.disable()
+        finally:
+            self._lock.release()
+
+        view_class = getattr(view_func, 'view_class', None)
+        view_name = view_class.__name__ if view_class else view_func.__name__
+        self.dump([profiler, *thread_profiles], view_name, time.perf_counter() - started)
+        return response
+
+    def dump(self, profilers: list, view_name: str, seconds: float) -> None:
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{view_name}-{seconds * 1000:.0f}ms"
+        try:
+            stats = pstats.Stats(*profilers)
+            if self.output_format == 'collapsed':
+                lines = collapsed_stacks(stats)
+                (self.directory / f'{name}.collapsed').write_text('\n'.join(lines) + '\n')
+            else:
+                stats.dump_stats(self.directory / f'{name}.pstats')
+        except OSError as e:
+            logger.error(f"Erro ao gravar o profiling de {view_name}: {str(e)}")
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SUAPSnapshot',
+            fields=[
+                ('key', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('student', models.CharField(db_index=True, max_length=64)),
+                ('endpoint', models.CharField(max_length=32)),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+                ('data', models.BinaryField()),
+            ],
+            options={
+                'db_table': 'portal_estudante_suap_snapshot',
+            },
+        ),
+    ]
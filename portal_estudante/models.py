@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class SUAPSnapshot(models.Model):
+    """Última resposta do SUAP guardada no banco, para sobreviver à troca de instância.
+
+    ``key`` é a mesma chave usada no cache do cliente SUAP (endpoint, hash do
+    aluno e parâmetros); ``data`` é o JSON da resposta comprimido com zlib.
+    """
+    key = models.CharField(max_length=200, primary_key=True)
+    student = models.CharField(max_length=64, db_index=True)
+    endpoint = models.CharField(max_length=32)
+    fetched_at = models.DateTimeField(db_index=True)
+    data = models.BinaryField()
+
+    class Meta:
+        db_table = 'portal_estudante_suap_snapshot'
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,140 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from api import format_grade
+from io import BytesIO
+import datetime
+import hashlib
+import json
+
+PDF_HEADER = ['Disciplina', 'N1', 'N2', 'Média', 'Final', 'M.Final', 'Faltas', 'Situação']
+COL_WIDTHS = [220, 38, 38, 48, 38, 48, 43, 65]
+CACHE_PREFIX = 'boletim_pdf'
+
+
+# O reportlab só é importado quando um PDF precisa mesmo ser gerado: ele pesa no
+# cold start e as demais rotas (e os 304 desta) não o usam
+@lru_cache(maxsize=1)
+def _styles() -> Dict[str, Any]:
+    """Estilos do relatório, montados uma única vez por processo"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=14,
+            spaceAfter=20
+        ),
+        'disciplina': ParagraphStyle(
+            'DisciplinaStyle',
+            parent=styles['Normal'],
+            fontSize=8,
+            leading=10,
+            alignment=0
+        ),
+        'info': ParagraphStyle(
+            'InfoStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=5
+        ),
+        'table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ROWHEIGHT', (0, 0), (-1, 0), 20),
+            ('ROWHEIGHT', (0, 1), (-1, -1), 30),
+            ('LEFTPADDING', (0, 0), (-1, -1), 5),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+        ])
+    }
+
+
+def _render(title: str, header: Tuple[str, ...], rows: List[List[str]]) -> bytes:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+
+    styles = _styles()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        rightMargin=25,
+        leftMargin=25,
+        topMargin=30,
+        bottomMargin=30
+    )
+
+    elements = [Paragraph(title, styles['title'])]
+    elements.extend(Paragraph(line, styles['info']) for line in header)
+    elements.append(Spacer(1, 15))
+
+    data = [PDF_HEADER] + [[Paragraph(row[0], styles['disciplina'])] + row[1:] for row in rows]
+    table = Table(data, colWidths=COL_WIDTHS, repeatRows=1)
+    table.setStyle(styles['table'])
+    elements.append(table)
+
+    # O horário é o da renderização: uma cópia vinda do cache mostra quando foi gerada
+    elements.append(Spacer(1, 15))
+    date_generated = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    elements.append(Paragraph(f"Gerado em: {date_generated}", styles['info']))
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+class BoletimPDF:
+    """PDF do boletim de um período, identificado pelo hash do seu conteúdo.
+
+    O hash cobre o cabeçalho e as linhas já formatadas, sem o horário de
+    geração; ele serve de ETag e de chave do cache, então enquanto as notas
+    não mudarem o download custa apenas uma leitura no cache.
+    """
+
+    def __init__(self, user_data: Dict[str, Any], ano: str, periodo: str, boletim):
+        self.title = f"Relatório Acadêmico - {ano}.{periodo}"
+        self.header = (
+            f"Aluno: {user_data.get('nome_registro', '')}",
+            f"Matrícula: {user_data.get('identificacao', '')}",
+            f"Curso: {user_data.get('curso', '')}",
+        )
+        self.rows = [[
+            subject.disciplina,
+            format_grade(subject.nota1, '--'),
+            format_grade(subject.nota2, '--'),
+            format_grade(subject.media, '--'),
+            format_grade(subject.nota_final, '--'),
+            format_grade(subject.media_final, '--'),
+            str(subject.faltas),
+            subject.situacao_suap
+        ] for subject in boletim or []]
+        self.digest = hashlib.sha256(
+            json.dumps([self.title, self.header, self.rows], ensure_ascii=False).encode()
+        ).hexdigest()
+
+    def render(self) -> bytes:
+        config = settings.PDF_CACHE
+        cache = caches[config.get('CACHE_ALIAS', 'default')]
+        key = f"{CACHE_PREFIX}:{self.digest}"
+
+        pdf = cache.get(key)
+        if pdf is None:
+            pdf = _render(self.title, self.header, self.rows)
+            cache.set(key, pdf, config.get('TIMEOUT', 3600))
+        return pdf
@@ -0,0 +1,68 @@
+"""Engines de sessão que evitam escritas desnecessárias.
+
+Com ``SESSION_SAVE_EVERY_REQUEST`` o Django grava a sessão inteira a cada
+requisição, inclusive nas consultas XHR que só leem. Estas engines comparam o
+conteúdo com o que foi lido e, se nada mudou, não regravam: apenas renovam a
+validade com uma operação barata (``touch``), e no máximo uma vez a cada
+``SESSION_TOUCH_INTERVAL`` segundos. O conteúdo continua comprimido pelo
+``signing.dumps`` do Django.
+
+Use ``portal_estudante.sessions.file`` ou ``portal_estudante.sessions.db``
+em ``SESSION_ENGINE``.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+import hashlib
+
+
+class WriteAvoidingSessionMixin:
+    """Pula a gravação quando o conteúdo não mudou; renova a validade em intervalos"""
+    skipped_save = False
+
+    def _digest(self, data) -> bytes:
+        return hashlib.sha256(self.serializer().dumps(data)).digest()
+
+    def _remember(self, data) -> None:
+        self._saved_digest = self._digest(data)
+        self._last_write = self._last_write_time() if self.session_key else None
+
+    def load(self):
+        data = super().load()
+        self._remember(data)
+        return data
+
+    async def aload(self):
+        data = await super().aload()
+        self._remember(data)
+        return data
+
+    def _unchanged(self) -> bool:
+        if self.session_key is None:
+            return False
+        return getattr(self, '_saved_digest', None) == self._digest(self._get_session())
+
+    def _touch_due(self) -> bool:
+        interval = timedelta(seconds=getattr(settings, 'SESSION_TOUCH_INTERVAL', 300))
+        last_write = getattr(self, '_last_write', None)
+        return last_write is None or timezone.now() - last_write >= interval
+
+    def save(self, must_create=False):
+        if not must_create and self._unchanged():
+            self.skipped_save = True
+            if self._touch_due():
+                self.touch()
+                self._last_write = timezone.now()
+            return
+        super().save(must_create=must_create)
+        self.skipped_save = False
+        self._saved_digest = self._digest(self._get_session(no_load=must_create))
+        self._last_write = timezone.now()
+
+    def _last_write_time(self):
+        """Quando a sessão foi gravada ou renovada pela última vez (None se desconhecido)"""
+        raise NotImplementedError
+
+    def touch(self) -> None:
+        """Renova a validade da sessão sem regravar o conteúdo"""
+        raise NotImplementedError
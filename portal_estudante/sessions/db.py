@@ -0,0 +1,26 @@
+from datetime import timedelta
+from django.contrib.sessions.backends import db
+from . import WriteAvoidingSessionMixin
+
+
+class SessionStore(WriteAvoidingSessionMixin, db.SessionStore):
+    """Sessões no banco; a validade é renovada com um UPDATE só do ``expire_date``"""
+
+    def _get_session_from_db(self):
+        session = super()._get_session_from_db()
+        self._expire_date = session.expire_date if session else None
+        return session
+
+    async def _aget_session_from_db(self):
+        session = await super()._aget_session_from_db()
+        self._expire_date = session.expire_date if session else None
+        return session
+
+    def _last_write_time(self):
+        expire_date = getattr(self, '_expire_date', None)
+        if expire_date is None:
+            return None
+        return expire_date - timedelta(seconds=self.get_session_cookie_age())
+
+    def touch(self) -> None:
+        self.model.objects.filter(session_key=self.session_key).update(expire_date=self.get_expiry_date())
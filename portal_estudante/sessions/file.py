@@ -0,0 +1,19 @@
+from django.contrib.sessions.backends import file
+from . import WriteAvoidingSessionMixin
+import os
+
+
+class SessionStore(WriteAvoidingSessionMixin, file.SessionStore):
+    """Sessões em arquivo; a validade vem da data de modificação, renovada com ``os.utime``"""
+
+    def _last_write_time(self):
+        try:
+            return self._last_modification()
+        except OSError:
+            return None
+
+    def touch(self) -> None:
+        try:
+            os.utime(self._key_to_file())
+        except OSError:
+            pass  # O arquivo sumiu: a próxima requisição recebe uma sessão nova
@@ -0,0 +1,195 @@
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Any, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, close_old_connections, connection, transaction
+import hashlib
+import json
+import logging
+import pickle
+import time
+import zlib
+from .models import SUAPSnapshot
+
+logger = logging.getLogger('portal_estudante')
+
+
+class StudentStore:
+    """Dados por período de um aluno, guardados fora da sessão.
+
+    Cada entrada fica na sua própria chave do cache, que expira sozinha depois
+    de ``ENTRY_TTL``; uma chave de índice por aluno guarda só nomes e tamanhos,
+    na ordem de uso. Gravações paralelas de entradas diferentes (ex.: o CSV de
+    todos os períodos) não se sobrescrevem: no pior caso o índice perde uma
+    atualização e a entrada apenas escapa do descarte LRU até expirar. Assim a
+    sessão guarda apenas a identidade e o token, com tamanho constante
+    independente de quantos períodos o aluno consultar.
+    """
+    KEY_PREFIX = 'student_store_v2'  # v1 guardava todas as entradas em uma única chave
+
+    def __init__(self, student_id: str):
+        config = settings.STUDENT_STORE
+        self.cache = caches[config.get('CACHE_ALIAS', 'default')]
+        self.max_entries = config.get('MAX_ENTRIES', 12)
+        self.max_bytes = config.get('MAX_BYTES', 256 * 1024)
+        self.entry_ttl = config.get('ENTRY_TTL', 300)
+        self.timeout = config.get('TIMEOUT', 86400)
+        student_hash = hashlib.sha256(str(student_id).encode()).hexdigest()[:32]
+        self.key = f"{self.KEY_PREFIX}:{student_hash}"
+
+    @classmethod
+    def for_user(cls, user_data: dict) -> Optional['StudentStore']:
+        student_id = (user_data or {}).get('identificacao')
+        return cls(student_id) if student_id else None
+
+    def _entry_key(self, name: str) -> str:
+        # O nome pode vir da URL (ex.: matrícula); o hash mantém a chave válida em qualquer backend
+        return f"{self.key}:{hashlib.sha256(name.encode()).hexdigest()[:16]}"
+
+    def _index(self) -> OrderedDict:
+        return self.cache.get(self.key) or OrderedDict()
+
+    def get(self, name: str) -> Any:
+        value = self.cache.get(self._entry_key(name))
+        if value is None:
+            return None
+
+        # Só regrava o índice (nomes e tamanhos) quando a ordem de uso realmente muda
+        index = self._index()
+        if name in index and next(reversed(index)) != name:
+            index.move_to_end(name)
+            self.cache.set(self.key, index, self.timeout)
+        return value
+
+    def set(self, name: str, value: Any) -> None:
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+
+        self.cache.set(self._entry_key(name), value, self.entry_ttl)
+        index = self._index()
+        index[name] = size
+        index.move_to_end(name)
+
+        evicted = []
+        total = sum(index.values())
+        while len(index) > self.max_entries or total > self.max_bytes:
+            evicted_name, evicted_size = index.popitem(last=False)
+            evicted.append(self._entry_key(evicted_name))
+            total -= evicted_size
+
+        self.cache.set(self.key, index, self.timeout)
+        if evicted:
+            self.cache.delete_many(evicted)
+
+    def clear(self) -> None:
+        index = self._index()
+        self.cache.delete_many([self._entry_key(name) for name in index] + [self.key])
+
+    async def aget(self, name: str) -> Any:
+        return await sync_to_async(self.get)(name)
+
+    async def aset(self, name: str, value: Any) -> None:
+        await sync_to_async(self.set)(name, value)
+
+
+class HistoryStore:
+    """Estatísticas dos períodos já encerrados de um aluno.
+
+    Um período encerrado não muda mais, então é agregado uma única vez e
+    guardado por muito mais tempo que o boletim; só o período em andamento
+    precisa ser recalculado a cada consulta ao histórico.
+    """
+    KEY_PREFIX = 'student_history'
+
+    def __init__(self, student_id: str):
+        config = settings.HISTORY_STORE
+        self.cache = caches[config.get('CACHE_ALIAS', 'default')]
+        self.timeout = config.get('TIMEOUT', 30 * 86400)
+        student_hash = hashlib.sha256(str(student_id).encode()).hexdigest()[:32]
+        self.key = f"{self.KEY_PREFIX}:{student_hash}"
+
+    @classmethod
+    def for_user(cls, user_data: dict) -> Optional['HistoryStore']:
+        student_id = (user_data or {}).get('identificacao')
+        return cls(student_id) if student_id else None
+
+    def get(self) -> dict:
+        return self.cache.get(self.key) or {}
+
+    def update(self, stats: dict) -> None:
+        if stats:
+            self.cache.set(self.key, {**self.get(), **stats}, self.timeout)
+
+    async def aget(self) -> dict:
+        return await sync_to_async(self.get)()
+
+    async def aupdate(self, stats: dict) -> None:
+        await sync_to_async(self.update)(stats)
+
+
+class SnapshotStore:
+    """Cópias duráveis das respostas do SUAP, na tabela ``SUAPSnapshot``.
+
+    Cache em memória e sessões em /tmp somem a cada instância nova da função;
+    o banco não. O cliente SUAP consulta este store quando o cache está frio
+    e grava nele cada resposta nova, com a data em que foi buscada. Falhas do
+    banco nunca derrubam a requisição: a cópia é simplesmente ignorada.
+    """
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Retorna ``(fetched_at, valor)`` como nas entradas do cache, ou None"""
+        try:
+            with _savepoint():
+                snapshot = SUAPSnapshot.objects.filter(key=key).only('fetched_at', 'data').first()
+        except DatabaseError as e:
+            logger.warning(f"Erro ao ler snapshot do SUAP: {str(e)}")
+            return None
+        finally:
+            _release_connection()
+        if snapshot is None:
+            return None
+        return snapshot.fetched_at.timestamp(), json.loads(zlib.decompress(snapshot.data))
+
+    def set(self, key: str, fetched_at: float, value: Any) -> None:
+        _prefix, endpoint, student = key.split(':')[:3]
+        data = zlib.compress(json.dumps(value, separators=(',', ':')).encode(), 6)
+        snapshot = SUAPSnapshot(
+            key=key,
+            student=student,
+            endpoint=endpoint,
+            fetched_at=datetime.fromtimestamp(fetched_at, tz=timezone.utc),
+            data=data
+        )
+        try:
+            # Um único INSERT ... ON CONFLICT DO UPDATE, sem ler a linha antes
+            with _savepoint():
+                SUAPSnapshot.objects.bulk_create(
+                    [snapshot], update_conflicts=True, unique_fields=['key'],
+                    update_fields=['student', 'endpoint', 'fetched_at', 'data']
+                )
+        except DatabaseError as e:
+            logger.warning(f"Erro ao gravar snapshot do SUAP: {str(e)}")
+        finally:
+            _release_connection()
+
+    def prune(self, max_age: float) -> int:
+        """Apaga as cópias buscadas há mais de ``max_age`` segundos"""
+        cutoff = datetime.fromtimestamp(time.time() - max_age, tz=timezone.utc)
+        deleted, _ = SUAPSnapshot.objects.filter(fetched_at__lt=cutoff).delete()
+        return deleted
+
+
+def _savepoint():
+    # Dentro da transação de uma view, um erro do banco não pode invalidar o resto dela
+    return transaction.atomic() if connection.in_atomic_block else nullcontext()
+
+
+def _release_connection() -> None:
+    # O cliente SUAP roda em threads de I/O, fora do ciclo de requisição que
+    # fecharia a conexão; sem isso cada thread ficaria com uma conexão aberta
+    if not connection.in_atomic_block:
+        close_old_connections()
@@ -1,3 +1,174 @@
-from django.test import TestCase
+from unittest import mock
+import time
+from requests import HTTPError
+from django.test import SimpleTestCase, override_settings
+from api import SUAPAPI, SUAPUnavailable
+from api.circuit import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from api.solver import PESOS, _solve
+from api import Boletim, GradeSolver, track_stale
+from portal_estudante.store import StudentStore
 
-# Create your tests here.
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def test_opens_after_failure_rate_and_probes_once(self):
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=2, window=4, open_seconds=0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())  # Só uma chamada de teste por vez
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(min_calls=1, open_seconds=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+
+class MakeRequestLimiterTests(SimpleTestCase):
+    URL = 'https://suap.example/api/rh/eu/'
+
+    def setUp(self):
+        self.api = SUAPAPI()
+        self.breaker = self.api._breakers.get(self.api._endpoint_name(self.URL))
+        self.limiter = self.api._limiters.get('suap.example')
+        # Circuito pronto para a chamada de teste (meio-aberto)
+        self.breaker.state = OPEN
+        self.breaker._opened_until = 0
+
+    def test_rate_limited_call_does_not_take_the_probe(self):
+        with mock.patch.object(self.limiter._bucket, 'try_acquire', return_value=1.0):
+            with self.assertRaises(SUAPUnavailable):
+                self.api._make_request('GET', self.URL)
+
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {'ok': True}
+        with mock.patch.object(self.api.session, 'request', return_value=response):
+            self.assertEqual(self.api._make_request('GET', self.URL), {'ok': True})
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_open_circuit_releases_limiter_slot(self):
+        self.breaker._opened_until = float('inf')
+        with mock.patch.object(self.limiter, 'release') as release:
+            self.assertIsNone(self.api._make_request('GET', self.URL))
+        release.assert_called_once_with()
+
+
+class CachedStaleTests(SimpleTestCase):
+    URL = 'https://suap.example/api/v2/minhas-informacoes/boletim/2024/2/'
+
+    def setUp(self):
+        self.api = SUAPAPI()
+        self.api.backoff_max = 0
+        self.key = self.api._cache_key('boletim', 'token', '2024', '2')
+        # Cópia vencida além do stale-while-revalidate: só é servida se o SUAP falhar
+        fetched_at = time.time() - self.api._ttl('boletim') - self.api.stale_while_revalidate - 1
+        self.api.cache.set(self.key, (fetched_at, [{'disciplina': 'antiga'}]))
+
+    def tearDown(self):
+        self.api.cache.delete(self.key)
+
+    def fetch(self, status):
+        response = mock.Mock(status_code=status)
+        response.raise_for_status.side_effect = HTTPError(response=response)
+        with mock.patch.object(self.api.session, 'request', return_value=response), track_stale() as stale:
+            value = self.api._cached(
+                'boletim', 'token', ('2024', '2'), lambda: self.api._make_request('GET', self.URL)
+            )
+        return value, stale
+
+    def test_server_error_serves_last_copy(self):
+        value, stale = self.fetch(503)
+        self.assertEqual(value, [{'disciplina': 'antiga'}])
+        self.assertIn('boletim', stale)
+
+    def test_auth_error_is_not_hidden_by_stale_copy(self):
+        value, stale = self.fetch(401)
+        self.assertIsNone(value)
+        self.assertFalse(stale)
+
+
+@override_settings(STUDENT_STORE={'CACHE_ALIAS': 'default', 'MAX_ENTRIES': 3, 'MAX_BYTES': 64 * 1024})
+class StudentStoreTests(SimpleTestCase):
+
+    def setUp(self):
+        self.store = StudentStore('20231234')
+        self.store.clear()
+
+    def test_entries_are_independent(self):
+        # Um índice desatualizado (gravação concorrente) não apaga a entrada do outro período
+        other = StudentStore('20231234')
+        self.store.set('boletim:2024.1', 'a')
+        stale_index = other._index()
+        self.store.set('boletim:2024.2', 'b')
+        other.cache.set(other.key, stale_index)
+        self.assertEqual(self.store.get('boletim:2024.1'), 'a')
+        self.assertEqual(self.store.get('boletim:2024.2'), 'b')
+
+    def test_evicts_least_recently_used(self):
+        for name in ('a', 'b', 'c'):
+            self.store.set(name, name)
+        self.store.get('a')
+        self.store.set('d', 'd')
+        self.assertIsNone(self.store.get('b'))
+        self.assertEqual([self.store.get(name) for name in ('a', 'c', 'd')], ['a', 'c', 'd'])
+
+    def test_clear_removes_entries(self):
+        self.store.set('a', 'a')
+        self.store.clear()
+        self.assertIsNone(self.store.get('a'))
+
+
+class SolverTests(SimpleTestCase):
+
+    def test_superior_missing_stage(self):
+        result = _solve((50, None), PESOS['superior'])
+        self.assertEqual((result['situacao'], result['proxima_etapa'], result['nota_necessaria']), ('Cursando', 2, 66.7))
+        self.assertEqual(_solve((100, None), PESOS['superior'])['situacao'], 'Cursando')
+        self.assertEqual(_solve((0, None), PESOS['superior'])['nota_necessaria'], 100.0)
+
+    def test_superior_complete(self):
+        self.assertEqual(_solve((60, 60), PESOS['superior'])['situacao'], 'Aprovado')
+        self.assertEqual(_solve((20, 20), PESOS['superior'])['situacao'], 'Reprovado')
+        result = _solve((50, 50), PESOS['superior'])
+        self.assertEqual((result['media'], result['situacao'], result['nota_final_necessaria']), (50, 'Prova Final', 66.7))
+
+    def test_tecnico_final_still_reachable(self):
+        # 60 é impossível, mas N4 = 100 dá média 51: ainda há prova final
+        result = _solve((30, 30, 30, None), PESOS['tecnico'])
+        self.assertEqual((result['situacao'], result['nota_necessaria']), ('Prova Final', 63.4))
+        self.assertEqual(_solve((30, 30, 30, 100), PESOS['tecnico'])['situacao'], 'Prova Final')
+
+    def test_tecnico_no_chance(self):
+        result = _solve((0, 0, 0, None), PESOS['tecnico'])
+        self.assertEqual((result['situacao'], result['nota_necessaria']), ('Reprovado', None))
+
+    def test_tecnico_already_approved(self):
+        result = _solve((100, 100, 100, None), PESOS['tecnico'])
+        self.assertEqual((result['situacao'], result['nota_necessaria']), ('Aprovado', 0.0))
+
+    def test_grade_solver_scenarios(self):
+        boletim = Boletim.from_api([{
+            'disciplina': 'Matemática', 'carga_horaria': 80, 'numero_faltas': 10,
+            'nota_etapa_1': {'nota': 50}, 'nota_etapa_2': {'nota': None},
+        }])
+        atual, cenario = GradeSolver(boletim, 'superior').solve([
+            {'nome': 'n2', 'disciplinas': {'Matemática': {'nota2': 70, 'faltas': 30}}},
+        ])
+        self.assertEqual(atual['disciplinas'][0]['nota_necessaria'], 66.7)
+        self.assertEqual(atual['disciplinas'][0]['faltas_restantes'], 10)
+        row = cenario['disciplinas'][0]
+        self.assertEqual((cenario['nome'], row['media'], row['situacao'], row['reprovado_por_faltas']), ('n2', 62, 'Aprovado', True))
+
+    def test_invalid_course(self):
+        with self.assertRaises(ValueError):
+            GradeSolver(Boletim.from_api([]), 'mestrado')
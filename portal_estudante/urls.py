@@ -1,11 +1,12 @@
 from django.urls import path
 from django.shortcuts import redirect
+from django.db import transaction
 from portal_estudante import views
 
 app_name = 'portal_estudante'
 
 urlpatterns = [
-    path('', lambda request: redirect('portal_estudante:dashboard'), name='home'),
+    path('', transaction.non_atomic_requests(lambda request: redirect('portal_estudante:dashboard')), name='home'),
     path('login/', views.LoginView.as_view(), name='login'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
     path('oauth/callback/', views.OAuthCallbackView.as_view(), name='oauth_callback'),
@@ -14,4 +15,9 @@ urlpatterns = [
     path('export/pdf/', views.ExportPDFView.as_view(), name='export_pdf'),
     path('export/csv/', views.ExportCSVView.as_view(), name='export_csv'),
     path('simulator/', views.SimulatorView.as_view(), name='simulator'),
+    path('history/', views.HistoryView.as_view(), name='history'),
+    path('solver/', views.SolverView.as_view(), name='solver'),
+    path('events/grades/', views.GradeEventsView.as_view(), name='grade_events'),
+    path('period-data/', views.PeriodDataView.as_view(), name='period_data'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
 ] 
\ No newline at end of file
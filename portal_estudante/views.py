@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse, Http404
 from django.urls import reverse
 from django.views import View
 from django.views.generic import TemplateView
@@ -8,19 +9,176 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.cache import never_cache
-from api import SUAPAPI
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from io import BytesIO
+from django.views.decorators.vary import vary_on_headers
+from django.utils.cache import (
+    add_never_cache_headers, get_conditional_response, patch_cache_control, patch_vary_headers
+)
+from django.utils.http import quote_etag
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from api import (
+    get_client, get_async_client, Boletim, PeriodStats, build_history, format_grade, metrics, track_stale,
+    GradeSolver, detect_course, SUAPUnavailable, profiled
+)
+from api.solver import PESOS
+from .encoding import dumps, negotiate, compressed_cache
+from .events import watch
+from .pdf import BoletimPDF
+from .store import StudentStore, HistoryStore
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import wraps
+import asyncio
 import csv
 import secrets
 import logging
 import datetime
+import hashlib
+import json
 
 logger = logging.getLogger('student_portal')
 
+# Campos de rh/eu/ usados pelos templates e exportações; o resto não vai para a sessão
+SESSION_USER_FIELDS = ('identificacao', 'nome_usual', 'nome', 'nome_registro', 'curso', 'campus')
+
+def load_period(user_data, access_token, ano, periodo, grades=None, stale=False):
+    """Entrada ``(hash, boletim, respostas)`` do período, guardada por aluno no StudentStore.
+
+    O JSON do SUAP é convertido em ``Boletim`` uma única vez por resposta; as
+    demais views e exportações do mesmo período reaproveitam o modelo pronto.
+    O modelo guardado leva o hash do JSON de onde veio: quando a view passa
+    ``grades`` recém-buscadas e elas mudaram, o boletim é interpretado de novo.
+    ``respostas`` guarda o JSON já serializado das views (ver ``period_json``)
+    e é ``None`` nos boletins que não foram guardados, como os montados a
+    partir de uma cópia vencida (``stale``).
+    """
+    store = StudentStore.for_user(user_data)
+    store_key = f'boletim:{ano}.{periodo}'
+    entry = store.get(store_key) if store else None
+    if not isinstance(entry, tuple) or len(entry) != 3:
+        entry = None  # Entradas de um formato anterior, sem como saber de onde vieram
+    if entry is not None and grades is None:
+        return entry
+    
+    if grades is None:
+        with track_stale() as marker:
+            grades = get_client().get_user_grades(access_token, ano, periodo)
+        stale = stale or 'boletim' in marker
+    if grades is None:
+        return None
+    
+    digest = hashlib.sha256(dumps(grades)).hexdigest()[:32]
+    if entry is not None and entry[0] == digest:
+        return entry
+    
+    boletim = Boletim.from_api(grades)
+    if store and len(boletim) and not stale:
+        entry = (digest, boletim, {})
+        store.set(store_key, entry)
+        return entry
+    return digest, boletim, None
+
+def load_boletim(user_data, access_token, ano, periodo, grades=None, stale=False):
+    """Retorna o boletim do período já interpretado (ver ``load_period``)"""
+    entry = load_period(user_data, access_token, ano, periodo, grades, stale)
+    return entry[1] if entry else None
+
+aload_period = sync_to_async(profiled(load_period), thread_sensitive=False)
+aload_boletim = sync_to_async(profiled(load_boletim), thread_sensitive=False)
+
+# Variações de JSON (seções, diários, curso) guardadas por período
+MAX_PERIOD_RESPONSES = 8
+
+async def period_json(request, user_data, ano, periodo, entry, variant, build, stale=None):
+    """Resposta JSON derivada do boletim, serializada uma vez por versão do boletim.
+
+    Os bytes e o ETag ficam na própria entrada do período no StudentStore, sob
+    ``variant`` (que deve incluir tudo além do boletim de que a resposta
+    depende); um boletim novo descarta tudo junto. Um 304 não serializa nem
+    calcula hash nenhum. Respostas com dados vencidos não são guardadas.
+    """
+    if stale or entry is None or entry[2] is None:
+        return json_response(request, {**build(), **stale_info(stale)})
+    
+    responses = entry[2]
+    cached = responses.get(variant)
+    if cached is None:
+        body = dumps(build())
+        cached = responses[variant] = (hashlib.sha256(body).hexdigest()[:32], body)
+        while len(responses) > MAX_PERIOD_RESPONSES:
+            responses.pop(next(iter(responses)))
+        store = StudentStore.for_user(user_data)
+        if store:
+            await store.aset(f'boletim:{ano}.{periodo}', entry)
+    etag, body = cached
+    return json_response(request, body=body, etag=etag)
+
+def stale_info(marker):
+    """Campos que avisam o front-end de que parte dos dados veio de uma cópia vencida"""
+    if not marker:
+        return {}
+    fetched_at = datetime.datetime.fromtimestamp(min(marker.values()), tz=datetime.timezone.utc)
+    return {'stale': True, 'fetched_at': fetched_at.isoformat()}
+
+def private_revalidate(view_func):
+    """Permite que o navegador guarde o JSON e as exportações, mas sempre os revalide pelo ETag.
+
+    A mesma URL devolve HTML ou JSON conforme o cabeçalho X-Requested-With.
+    As páginas HTML autenticadas não têm ETag e continuam com ``never_cache``
+    (no-store), para não reaparecerem pelo histórico depois do logout.
+    """
+    def patch(response):
+        if response.get('Content-Type', '').startswith('text/html'):
+            add_never_cache_headers(response)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    if iscoroutinefunction(view_func):
+        async def _async_wrapped_view(request, *args, **kwargs):
+            return patch(await view_func(request, *args, **kwargs))
+        view = wraps(view_func)(_async_wrapped_view)
+    else:
+        def _wrapped_view(request, *args, **kwargs):
+            return patch(view_func(request, *args, **kwargs))
+        view = wraps(view_func)(_wrapped_view)
+    return vary_on_headers('X-Requested-With')(view)
+
+def conditional_response(request, etag, build):
+    """Responde 304 quando o If-None-Match confere com o ETag; senão chama ``build``"""
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build()
+    response['ETag'] = etag
+    return response
+
+def json_response(request, data=None, body=None, etag=None):
+    """Resposta JSON com ETag forte, comprimida com br ou gzip quando o cliente aceita.
+
+    ``body`` permite passar o JSON já serializado (ex.: guardado no StudentStore),
+    com o ``etag`` calculado junto dele.
+    Cada codificação tem o seu ETag, como exige o HTTP para representações diferentes.
+    """
+    if body is None:
+        body = dumps(data)
+    if etag is None:
+        etag = hashlib.sha256(body).hexdigest()[:32]
+    encoding = negotiate(request.headers.get('Accept-Encoding', ''), len(body))
+    if encoding:
+        etag = f'{etag}-{encoding}'
+    
+    def build():
+        if not encoding:
+            return HttpResponse(body, content_type='application/json')
+        response = HttpResponse(compressed_cache.get(etag, encoding, body), content_type='application/json')
+        response['Content-Encoding'] = encoding
+        return response
+    
+    response = conditional_response(request, etag, build)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
 def require_suap_auth(view_func):
     """Decorator para verificar se o usuário está autenticado via SUAP"""
     def _wrapped_view(request, *args, **kwargs):
@@ -32,6 +190,14 @@ def require_suap_auth(view_func):
 
 def require_suap_auth_cbv(view_func):
     """Decorator para verificar se o usuário está autenticado via SUAP em Class-Based Views"""
+    if iscoroutinefunction(view_func):
+        async def _async_wrapped_view(self, request, *args, **kwargs):
+            if not await request.session.aget('access_token'):
+                logger.warning(f"Tentativa de acesso não autorizado à view {view_func.__name__}")
+                return redirect('portal_estudante:login')
+            return await view_func(self, request, *args, **kwargs)
+        return _async_wrapped_view
+
     def _wrapped_view(self, request, *args, **kwargs):
         if not request.session.get('access_token'):
             logger.warning(f"Tentativa de acesso não autorizado à view {view_func.__name__}")
@@ -39,6 +205,7 @@ def require_suap_auth_cbv(view_func):
         return view_func(self, request, *args, **kwargs)
     return _wrapped_view
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class LoginView(View):
     template_name = 'portal_estudante/login.html'
     
@@ -49,7 +216,7 @@ class LoginView(View):
             return redirect('portal_estudante:dashboard')
             
         if request.GET.get('auth') == 'suap':
-            suap_api = SUAPAPI()
+            suap_api = get_client()
             state = secrets.token_urlsafe(32)
             request.session['oauth_state'] = state
             
@@ -60,6 +227,7 @@ class LoginView(View):
         
         return render(request, self.template_name)
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class LogoutView(View):
     @method_decorator(csrf_protect)
     @method_decorator(require_http_methods(["POST"]))
@@ -67,9 +235,10 @@ class LogoutView(View):
         request.session.flush()
         return redirect('portal_estudante:login')
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class OAuthCallbackView(View):
     @method_decorator(never_cache)
-    def get(self, request):
+    async def get(self, request):
         error = request.GET.get('error')
         if error:
             logger.error(f"Erro no callback OAuth: {error}")
@@ -78,57 +247,60 @@ class OAuthCallbackView(View):
         code = request.GET.get('code')
         state = request.GET.get('state')
         
-        if not state or state != request.session.get('oauth_state'):
+        if not state or state != await request.session.apop('oauth_state', None):
             logger.error("Tentativa de callback OAuth com estado inválido")
             return JsonResponse({'error': 'Parâmetro de estado inválido'}, status=400)
         
-        suap_api = SUAPAPI()
+        suap_api = get_async_client()
         redirect_uri = request.build_absolute_uri(reverse('portal_estudante:oauth_callback'))
         
-        access_token = suap_api.get_token_from_code(code, redirect_uri)
+        access_token = await suap_api.get_token_from_code(code, redirect_uri)
         if not access_token:
             logger.error("Falha ao obter token de acesso")
             return JsonResponse({'error': 'Não foi possível obter o token de acesso'}, status=400)
         
-        user_data = suap_api.get_user_data(access_token)
+        # Os períodos já são buscados junto com os dados do usuário para que o
+        # primeiro acesso ao dashboard encontre o cache do cliente aquecido
+        user_data, _periods = await asyncio.gather(
+            suap_api.get_user_data(access_token),
+            suap_api.get_academic_periods(access_token)
+        )
         if not user_data:
             logger.error("Falha ao obter dados do usuário")
             return JsonResponse({'error': 'Não foi possível obter os dados do usuário'}, status=400)
         
-        request.session['access_token'] = access_token
-        request.session['user_data'] = user_data
-        request.session['last_activity'] = datetime.datetime.now().isoformat()
+        await request.session.aset('access_token', access_token)
+        await request.session.aset('user_data', {
+            field: user_data[field] for field in SESSION_USER_FIELDS if field in user_data
+        })
+        await request.session.aset('last_activity', datetime.datetime.now().isoformat())
         
         return redirect('portal_estudante:dashboard')
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class DashboardView(TemplateView):
     template_name = 'portal_estudante/dashboard.html'
     
-    @method_decorator(never_cache)
+    @method_decorator(private_revalidate)
     @method_decorator(csrf_protect)
     @require_suap_auth_cbv
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         try:
-            suap_api = SUAPAPI()
-            access_token = request.session.get('access_token')
+            suap_api = get_async_client()
+            access_token = await request.session.aget('access_token')
             
             if not access_token:
                 logger.warning("Token de acesso não encontrado")
-                request.session.flush()
+                await request.session.aflush()
                 return redirect('portal_estudante:login')
                 
-            suap_api.access_token = access_token
-            
             try:
-                user_data = request.session.get('user_data', {})
+                user_data = await request.session.aget('user_data', {})
                 
-                periods = request.session.get('academic_periods')
+                periods = await suap_api.get_academic_periods(access_token)
                 if not periods:
-                    periods = suap_api.get_academic_periods()
-                    if not periods:
-                        logger.error("Não foi possível obter os períodos acadêmicos")
-                        raise Exception("Erro ao obter períodos acadêmicos")
-                    request.session['academic_periods'] = periods
+                    logger.error("Não foi possível obter os períodos acadêmicos")
+                    raise Exception("Erro ao obter períodos acadêmicos")
                 
                 selected_year = request.GET.get('ano')
                 selected_period = request.GET.get('periodo')
@@ -140,14 +312,10 @@ class DashboardView(TemplateView):
                         selected_period = str(latest_period.get('periodo_letivo'))
                         return redirect(f"{reverse('portal_estudante:dashboard')}?ano={selected_year}&periodo={selected_period}")
                 
-                periods_cache_key = 'formatted_periods'
-                formatted_periods = request.session.get(periods_cache_key)
-                if not formatted_periods:
-                    formatted_periods = [{
-                        'ano_letivo': str(p['ano_letivo']),
-                        'periodo_letivo': str(p['periodo_letivo'])
-                    } for p in periods]
-                    request.session[periods_cache_key] = formatted_periods
+                formatted_periods = [{
+                    'ano_letivo': str(p['ano_letivo']),
+                    'periodo_letivo': str(p['periodo_letivo'])
+                } for p in periods]
                 
                 context = self.get_context_data(
                     user_data=user_data,
@@ -158,105 +326,106 @@ class DashboardView(TemplateView):
                 )
                 
                 if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                    cache_key = f'dashboard_data_{selected_year}_{selected_period}'
-                    dashboard_data = request.session.get(cache_key)
-                    
-                    if not dashboard_data:
-                        grades = suap_api.get_user_grades(selected_year, selected_period)
-                        if not grades:
-                            raise Exception("Erro ao obter notas")
-                        
-                        totals = {
-                            'total_classes': 0,
-                            'total_classes_given': 0,
-                            'total_absences': 0,
-                            'total_frequency': 0
-                        }
-                        
-                        summary = {
-                            'total_subjects': len(grades) if grades else 0,
-                            'approved_subjects': 0,
-                            'at_risk_subjects': 0
-                        }
-                        
-                        if grades:
-                            for subject in grades:
-                                try:
-                                    ch = int(subject.get('carga_horaria', 0) or 0)
-                                    ch_cumprida = int(subject.get('carga_horaria_cumprida', 0) or 0)
-                                    faltas = int(subject.get('numero_faltas', 0) or 0)
-                                    media_disciplina = float(subject.get('media_disciplina', 0) or 0)
-                                    nota1 = subject.get('nota_etapa_1', {}).get('nota')
-                                    nota2 = subject.get('nota_etapa_2', {}).get('nota')
-                                    
-                                    totals['total_classes'] += ch
-                                    totals['total_classes_given'] += ch_cumprida
-                                    totals['total_absences'] += faltas
-                                    
-                                    if (subject.get('situacao') == 'Aprovado' or 
-                                        (nota1 is not None and nota2 is not None and media_disciplina >= 60)):
-                                        summary['approved_subjects'] += 1
-                                    else:
-                                        summary['at_risk_subjects'] += 1
-                                except (ValueError, TypeError) as e:
-                                    logger.error(f"Erro ao processar disciplina: {str(e)}")
-                                    continue
-                            
-                            if totals['total_classes_given'] > 0:
-                                totals['total_frequency'] = round(
-                                    ((totals['total_classes_given'] - totals['total_absences']) / totals['total_classes_given']) * 100,
-                                    2
-                                )
-                        
-                        semester = f"{selected_year}/{selected_period}"
-                        disciplines = suap_api.get_diaries(semester)
-                        
-                        dashboard_data = {
-                            'grades': grades,
-                            'disciplines': disciplines,
-                            'totals': totals,
-                            'summary': summary
-                        }
-                        
-                        request.session[cache_key] = dashboard_data
+                    # Boletim e diários vêm do cache compartilhado do cliente SUAP
+                    semester = f"{selected_year}/{selected_period}"
+                    with track_stale() as stale:
+                        grades, disciplines = await asyncio.gather(
+                            suap_api.get_user_grades(access_token, selected_year, selected_period),
+                            suap_api.get_diaries(access_token, semester)
+                        )
+                    if not grades:
+                        raise Exception("Erro ao obter notas")
                     
-                    return JsonResponse(dashboard_data)
+                    entry = await aload_period(
+                        user_data, access_token, selected_year, selected_period, grades, 'boletim' in stale
+                    )
+                    hours = self.discipline_hours(disciplines)
+                    return await period_json(
+                        request, user_data, selected_year, selected_period, entry,
+                        f'dashboard:{hashlib.sha256(dumps(hours)).hexdigest()[:16]}',
+                        lambda: self.page_data(entry[1], disciplines, hours), stale
+                    )
                 
                 return self.render_to_response(context)
                 
+            except SUAPUnavailable:
+                raise
             except Exception as e:
                 logger.error(f"Erro ao processar dados: {str(e)}")
                 if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                     return JsonResponse({'error': 'Erro ao carregar dados. Por favor, faça login novamente.'}, status=401)
-                request.session.flush()
+                await request.session.aflush()
                 return redirect('portal_estudante:login')
                 
+        except SUAPUnavailable:
+            raise
         except Exception as e:
             logger.error(f"Erro ao acessar dados do SUAP: {str(e)}")
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 return JsonResponse({'error': 'Sessão expirada. Por favor, faça login novamente.'}, status=401)
-            request.session.flush()
+            await request.session.aflush()
             return redirect('portal_estudante:login')
 
+    @classmethod
+    def page_data(cls, boletim, diaries, hours=None):
+        """Dados da página, compartilhados com o PeriodDataView"""
+        return {
+            'subjects': cls.build_subject_rows(boletim, diaries, hours),
+            'totals': boletim.totals,
+            'summary': boletim.summary
+        }
+    
+    @staticmethod
+    def discipline_hours(diaries):
+        """Carga horária de cada disciplina pelo nome: tudo o que a página usa dos diários"""
+        hours = {}
+        for diary in diaries or []:
+            discipline = diary.get('disciplina') or {}
+            hours.setdefault(discipline.get('nome'), discipline.get('ch_total_aula'))
+        return hours
+    
+    @classmethod
+    def build_subject_rows(cls, boletim, diaries, hours=None):
+        """Linhas do boletim já unidas aos dados da disciplina vindos dos diários"""
+        # Índice nome -> carga horária montado uma vez, em vez de percorrer os diários por linha
+        if hours is None:
+            hours = cls.discipline_hours(diaries)
+        
+        return [{
+            'disciplina': subject.disciplina,
+            'carga_horaria': hours.get(subject.disciplina) or subject.carga_horaria,
+            'carga_horaria_cumprida': subject.carga_horaria_cumprida,
+            'faltas': subject.faltas,
+            'frequencia': subject.frequencia,
+            'nota1': subject.nota1,
+            'nota2': subject.nota2,
+            'media': subject.media,
+            'nota_final': subject.nota_final,
+            'media_final': subject.media_final,
+            'situacao': subject.situacao
+        } for subject in boletim]
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class StudentInfoView(View):
     @method_decorator(never_cache)
     @method_decorator(csrf_protect)
     @require_suap_auth_cbv
     def get(self, request, registration):
-        suap_api = SUAPAPI()
-        suap_api.access_token = request.session['access_token']
+        suap_api = get_client()
+        access_token = request.session['access_token']
         
-        cache_key = f'student_info_{registration}'
-        cached_data = request.session.get(cache_key)
+        store = StudentStore.for_user(request.session.get('user_data'))
+        cache_key = f'student_info:{registration}'
+        cached_data = store.get(cache_key) if store else None
         
-        if cached_data:
-            return JsonResponse(cached_data)
+        if isinstance(cached_data, bytes):
+            return json_response(request, body=cached_data)
         
-        student_data = suap_api.get_student_data(registration)
+        student_data = suap_api.get_student_data(access_token, registration)
         if not student_data:
             return JsonResponse({'error': 'Não foi possível buscar dados do estudante'}, status=400)
         
-        grades_data = suap_api.get_student_grades(registration)
+        grades_data = suap_api.get_student_grades(access_token, registration)
         if not grades_data:
             return JsonResponse({'error': 'Não foi possível buscar notas do estudante'}, status=400)
         
@@ -272,28 +441,35 @@ class StudentInfoView(View):
             'summary': summary
         }
         
-        request.session[cache_key] = processed_data
+        # Guarda o JSON já serializado: as próximas consultas só devolvem os bytes
+        body = dumps(processed_data)
+        if store:
+            store.set(cache_key, body)
         
-        return JsonResponse(processed_data)
+        return json_response(request, body=body)
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class ReportView(TemplateView):
     template_name = 'portal_estudante/report.html'
     
-    @method_decorator(never_cache)
+    @method_decorator(private_revalidate)
     @method_decorator(csrf_protect)
     @require_suap_auth_cbv
-    def get(self, request, *args, **kwargs):
-        suap_api = SUAPAPI()
-        suap_api.access_token = request.session['access_token']
+    async def get(self, request, *args, **kwargs):
+        suap_api = get_async_client()
+        access_token = await request.session.aget('access_token')
         
-        user_data = request.session.get('user_data', {})
+        user_data = await request.session.aget('user_data', {})
         selected_year = request.GET.get('ano')
         selected_period = request.GET.get('periodo')
         
-        periods = request.session.get('academic_periods')
-        if not periods:
-            periods = suap_api.get_academic_periods()
-            request.session['academic_periods'] = periods
+        # Períodos e notas não dependem um do outro: são buscados em paralelo
+        pending = {'periods': suap_api.get_academic_periods(access_token)}
+        if selected_year and selected_period:
+            pending['entry'] = aload_period(user_data, access_token, selected_year, selected_period)
+        with track_stale() as stale:
+            fetched = dict(zip(pending, await asyncio.gather(*pending.values())))
+        periods = fetched['periods'] or []
         
         if not selected_year or not selected_period:
             if periods:
@@ -310,63 +486,55 @@ class ReportView(TemplateView):
             'periodo_letivo': str(p.get('periodo_letivo'))
         } for p in periods]
         
-        cache_key = f'report_data_{selected_year}_{selected_period}'
-        report_data = request.session.get(cache_key)
-        
-        if not report_data:
-            grades_data = suap_api.get_user_grades(selected_year, selected_period)
-            report_data = self.process_grades_data(grades_data)
-            request.session[cache_key] = report_data
+        entry = fetched.get('entry')
+        boletim = entry[1] if entry else None
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            return JsonResponse({
-                'report_data': report_data,
-                'selected_year': selected_year,
-                'selected_period': selected_period
-            })
+            return await period_json(
+                request, user_data, selected_year, selected_period, entry, 'report',
+                lambda: {
+                    'report_data': self.process_grades_data(boletim),
+                    'selected_year': selected_year,
+                    'selected_period': selected_period,
+                },
+                stale
+            )
         
         context = self.get_context_data(
             user_data=user_data,
             selected_year=selected_year,
             selected_period=selected_period,
-            report_data=report_data,
+            report_data=self.process_grades_data(boletim),
             periods=formatted_periods
         )
         
         return self.render_to_response(context)
     
     @staticmethod
-    def process_grades_data(grades_data):
-        if not isinstance(grades_data, list):
+    def process_grades_data(boletim):
+        if not boletim:
             return []
             
         return [{
-            'disciplina': subject.get('disciplina', ''),
-            'nota1': float(subject.get('nota_etapa_1', {}).get('nota', 0) or 0),
-            'nota2': float(subject.get('nota_etapa_2', {}).get('nota', 0) or 0),
-            'media': float(subject.get('media_disciplina', 0) or 0),
-            'final': float(subject.get('nota_avaliacao_final', {}).get('nota', 0) or 0),
-            'media_final': float(subject.get('media_final_disciplina', 0) or 0),
-            'situacao': (
-                'Aprovado' 
-                if subject.get('situacao') == 'Aprovado' or
-                   (subject.get('nota_etapa_1', {}).get('nota') and 
-                    subject.get('nota_etapa_2', {}).get('nota') and 
-                    float(subject.get('media_disciplina', 0) or 0) >= 60)
-                else 'Cursando'
-            ),
-            'faltas': int(subject.get('numero_faltas', 0)),
-            'max_faltas': int(subject.get('carga_horaria', 0)) * 0.25,
-            'faltas_restantes': max(0, int(subject.get('carga_horaria', 0)) * 0.25 - int(subject.get('numero_faltas', 0))),
-            'carga_horaria': int(subject.get('carga_horaria', 0))
-        } for subject in grades_data]
+            'disciplina': subject.disciplina,
+            'nota1': subject.nota1 or 0,
+            'nota2': subject.nota2 or 0,
+            'media': subject.media or 0,
+            'final': subject.nota_final or 0,
+            'media_final': subject.media_final or 0,
+            'situacao': subject.situacao,
+            'faltas': subject.faltas,
+            'max_faltas': subject.max_faltas,
+            'faltas_restantes': subject.faltas_restantes,
+            'carga_horaria': subject.carga_horaria
+        } for subject in boletim]
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class ExportPDFView(View):
-    @method_decorator(never_cache)
+    @method_decorator(private_revalidate)
     @require_suap_auth_cbv
     def get(self, request):
-        suap_api = SUAPAPI()
-        suap_api.access_token = request.session['access_token']
+        access_token = request.session['access_token']
         
         selected_year = request.GET.get('ano')
         selected_period = request.GET.get('periodo')
@@ -375,108 +543,48 @@ class ExportPDFView(View):
             messages.error(request, 'Ano e período são obrigatórios')
             return redirect('portal_estudante:report')
         
-        grades_data = suap_api.get_user_grades(selected_year, selected_period)
         user_data = request.session.get('user_data', {})
+        boletim = load_boletim(user_data, access_token, selected_year, selected_period)
+        if boletim is None:
+            # Um PDF vazio pareceria o boletim real, e ainda ficaria no cache com ETag
+            messages.error(request, 'Não foi possível obter as notas do período. Tente novamente.')
+            return redirect('portal_estudante:report')
         
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=letter,
-            rightMargin=25,
-            leftMargin=25,
-            topMargin=30,
-            bottomMargin=30
-        )
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=14,
-            spaceAfter=20
-        )
-        
-        disciplina_style = ParagraphStyle(
-            'DisciplinaStyle',
-            parent=styles['Normal'],
-            fontSize=8,
-            leading=10,
-            alignment=0
-        )
-        
-        title = Paragraph(f"Relatório Acadêmico - {selected_year}.{selected_period}", title_style)
-        elements.append(title)
+        document = BoletimPDF(user_data, selected_year, selected_period, boletim)
         
-        info_style = ParagraphStyle(
-            'InfoStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=5
-        )
-        elements.append(Paragraph(f"Aluno: {user_data.get('nome_registro', '')}", info_style))
-        elements.append(Paragraph(f"Matrícula: {user_data.get('identificacao', '')}", info_style))
-        elements.append(Paragraph(f"Curso: {user_data.get('curso', '')}", info_style))
-        elements.append(Spacer(1, 15))
-        
-        data = [['Disciplina', 'N1', 'N2', 'Média', 'Final', 'M.Final', 'Faltas', 'Situação']]
-        
-        for subject in grades_data:
-            disciplina = Paragraph(subject.get('disciplina', ''), disciplina_style)
-            data.append([
-                disciplina,
-                subject.get('nota_etapa_1', {}).get('nota', '--'),
-                subject.get('nota_etapa_2', {}).get('nota', '--'),
-                subject.get('media_disciplina', '--'),
-                subject.get('nota_avaliacao_final', {}).get('nota', '--'),
-                subject.get('media_final_disciplina', '--'),
-                subject.get('numero_faltas', '0'),
-                subject.get('situacao', 'Cursando')
-            ])
-        
-        col_widths = [220, 38, 38, 48, 38, 48, 43, 65]
-        table = Table(data, colWidths=col_widths, repeatRows=1)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWHEIGHT', (0, 0), (-1, 0), 20),
-            ('ROWHEIGHT', (0, 1), (-1, -1), 30),
-            ('LEFTPADDING', (0, 0), (-1, -1), 5),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-        ]))
-        
-        elements.append(table)
-        
-        elements.append(Spacer(1, 15))
-        date_generated = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-        elements.append(Paragraph(f"Gerado em: {date_generated}", info_style))
-        
-        doc.build(elements)
-        
-        buffer.seek(0)
-        response = HttpResponse(buffer, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="relatorio_{selected_year}_{selected_period}.pdf"'
+        def build():
+            response = HttpResponse(document.render(), content_type='application/pdf')
+            response['Content-Disposition'] = f'attachment; filename="relatorio_{selected_year}_{selected_period}.pdf"'
+            return response
         
-        return response
+        # O ETag vem do conteúdo: um 304 dispensa até a leitura do PDF no cache
+        return conditional_response(request, document.digest, build)
+
+class Echo:
+    """Buffer de uma linha só: o csv.writer devolve a linha pronta para ser enviada"""
+    def write(self, value):
+        return value
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class ExportCSVView(View):
-    @method_decorator(never_cache)
+    CSV_HEADER = ['Disciplina', 'Nota 1', 'Nota 2', 'Média', 'Final', 'Média Final', 'Faltas', 'Situação']
+    
+    @method_decorator(private_revalidate)
     @require_suap_auth_cbv
     def get(self, request):
-        suap_api = SUAPAPI()
-        suap_api.access_token = request.session['access_token']
+        access_token = request.session['access_token']
+        user_data = request.session.get('user_data', {})
+        
+        # ?todos=1 exporta o histórico completo em um único arquivo
+        if request.GET.get('todos'):
+            periods = get_client().get_academic_periods(access_token) or []
+            semesters = [(str(p.get('ano_letivo')), str(p.get('periodo_letivo'))) for p in periods]
+            if not semesters:
+                # Sem a lista de períodos o arquivo sairia só com o cabeçalho, parecendo completo
+                messages.error(request, 'Não foi possível obter os períodos letivos. Tente novamente.')
+                return redirect('portal_estudante:report')
+            rows = self.all_periods_rows(user_data, access_token, semesters)
+            return self.csv_response(rows, 'relatorio_completo.csv')
         
         selected_year = request.GET.get('ano')
         selected_period = request.GET.get('periodo')
@@ -485,46 +593,99 @@ class ExportCSVView(View):
             messages.error(request, 'Ano e período são obrigatórios')
             return redirect('portal_estudante:report')
         
-        grades_data = suap_api.get_user_grades(selected_year, selected_period)
-        user_data = request.session.get('user_data', {})
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="relatorio_{selected_year}_{selected_period}.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Disciplina', 'Nota 1', 'Nota 2', 'Média', 'Final', 'Média Final', 'Faltas', 'Situação'])
-        
-        for grade in grades_data:
-            writer.writerow([
-                grade.get('disciplina', ''),
-                grade.get('nota_etapa_1', {}).get('nota', ''),
-                grade.get('nota_etapa_2', {}).get('nota', ''),
-                grade.get('media_disciplina', ''),
-                grade.get('nota_avaliacao_final', {}).get('nota', ''),
-                grade.get('media_final_disciplina', ''),
-                grade.get('numero_faltas', '0'),
-                grade.get('situacao', 'Cursando')
-            ])
+        boletim = load_boletim(user_data, access_token, selected_year, selected_period)
+        if boletim is None:
+            messages.error(request, 'Não foi possível obter as notas do período. Tente novamente.')
+            return redirect('portal_estudante:report')
         
+        # Um período só é pequeno: as linhas são montadas antes para calcular o ETag
+        rows = list(self.period_rows(boletim))
+        etag = hashlib.sha256(dumps(rows)).hexdigest()[:32]
+        return conditional_response(
+            request,
+            etag,
+            lambda: self.csv_response(rows, f'relatorio_{selected_year}_{selected_period}.csv')
+        )
+    
+    @staticmethod
+    def csv_response(rows, filename):
+        writer = csv.writer(Echo())
+        response = StreamingHttpResponse((writer.writerow(row) for row in rows), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
         return response
+    
+    @staticmethod
+    def subject_row(subject):
+        return [
+            subject.disciplina,
+            format_grade(subject.nota1),
+            format_grade(subject.nota2),
+            format_grade(subject.media),
+            format_grade(subject.nota_final),
+            format_grade(subject.media_final),
+            subject.faltas,
+            subject.situacao_suap  # Exporta a situação oficial do SUAP (ex.: "Reprovado por falta")
+        ]
+    
+    def error_row(self, period):
+        message = 'ERRO: não foi possível obter as notas deste período'
+        return [period, message] + [''] * (len(self.CSV_HEADER) - 1)
+    
+    def period_rows(self, boletim):
+        yield self.CSV_HEADER
+        for subject in boletim:
+            yield self.subject_row(subject)
+    
+    def all_periods_rows(self, user_data, access_token, semesters):
+        """Busca todos os períodos em paralelo e emite as linhas na ordem em que os boletins chegam.
+
+        Um período que não pôde ser carregado vira uma linha de erro explícita,
+        para o arquivo nunca parecer completo sem estar.
+        """
+        yield ['Período'] + self.CSV_HEADER
+        
+        executor = ThreadPoolExecutor(max_workers=min(len(semesters), get_client().pool_size))
+        try:
+            futures = {
+                executor.submit(load_boletim, user_data, access_token, ano, periodo): f'{ano}.{periodo}'
+                for ano, periodo in semesters
+            }
+            for future in as_completed(futures):
+                try:
+                    boletim = future.result()
+                except Exception as e:
+                    logger.error(f"Erro ao exportar o período {futures[future]}: {str(e)}")
+                    boletim = None
+                if boletim is None:
+                    yield self.error_row(futures[future])
+                    continue
+                for subject in boletim:
+                    yield [futures[future]] + self.subject_row(subject)
+        finally:
+            # Se o download for interrompido, os períodos que faltam não são buscados
+            executor.shutdown(wait=False, cancel_futures=True)
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class SimulatorView(TemplateView):
     template_name = 'portal_estudante/simulator.html'
     
-    @method_decorator(never_cache)
+    @method_decorator(private_revalidate)
     @method_decorator(csrf_protect)
     @require_suap_auth_cbv
-    def get(self, request, *args, **kwargs):
-        suap_api = SUAPAPI()
-        suap_api.access_token = request.session.get('access_token')
+    async def get(self, request, *args, **kwargs):
+        suap_api = get_async_client()
+        access_token = await request.session.aget('access_token')
         
         selected_year = request.GET.get('ano')
         selected_period = request.GET.get('periodo')
         
-        periods = request.session.get('academic_periods')
-        if not periods:
-            periods = suap_api.get_academic_periods()
-            request.session['academic_periods'] = periods
+        # Períodos e notas não dependem um do outro: são buscados em paralelo
+        pending = {'periods': suap_api.get_academic_periods(access_token)}
+        if selected_year and selected_period:
+            pending['grades'] = suap_api.get_user_grades(access_token, selected_year, selected_period)
+        with track_stale() as stale:
+            fetched = dict(zip(pending, await asyncio.gather(*pending.values())))
+        periods = fetched['periods']
         
         if not selected_year or not selected_period:
             if periods:
@@ -533,56 +694,269 @@ class SimulatorView(TemplateView):
                 selected_period = latest_period.get('periodo_letivo') or latest_period.get('periodo')
                 return redirect(f"{reverse('portal_estudante:simulator')}?ano={selected_year}&periodo={selected_period}")
         
-        cache_key = f'simulator_data_{selected_year}_{selected_period}'
-        simulator_data = request.session.get(cache_key)
+        user_data = await request.session.aget('user_data', {})
+        grades = fetched.get('grades')
+        entry = await aload_period(
+            user_data, access_token, selected_year, selected_period, grades, 'boletim' in stale
+        ) if grades else None
+        boletim = entry[1] if entry else None
         
-        if not simulator_data:
-            grades = suap_api.get_user_grades(selected_year, selected_period)
-            totals = self.calculate_totals(grades) if grades else {
-                'total_classes': 0,
-                'total_absences': 0,
-                'total_frequency': 0,
-                'total_classes_given': 0
-            }
-            
-            simulator_data = {
-                'grades': grades,
-                'totals': totals
-            }
-            request.session[cache_key] = simulator_data
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return await period_json(
+                request, user_data, selected_year, selected_period, entry, 'simulator',
+                lambda: self.page_data(grades, boletim), stale
+            )
         
+        simulator_data = self.page_data(grades, boletim)
         context = self.get_context_data(
-            user_data=request.session.get('user_data', {}),
+            user_data=user_data,
             grades=simulator_data['grades'],
             totals=simulator_data['totals'],
             selected_year=selected_year,
             selected_period=selected_period
         )
         
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            return JsonResponse(simulator_data)
-        
         return self.render_to_response(context)
-
+    
     @staticmethod
-    def calculate_totals(grades):
-        if not isinstance(grades, list):
-            return {
-                'total_classes': 0,
-                'total_classes_given': 0,
-                'total_absences': 0,
-                'total_frequency': 0
-            }
-        
-        totals = {
-            'total_classes': sum(int(subject.get('carga_horaria', 0)) for subject in grades),
-            'total_classes_given': sum(int(subject.get('carga_horaria_cumprida', 0)) for subject in grades),
-            'total_absences': sum(int(subject.get('numero_faltas', 0)) for subject in grades)
+    def page_data(grades, boletim):
+        """Dados da página, compartilhados com o PeriodDataView"""
+        return {
+            'grades': grades,
+            'totals': boletim.totals if boletim else Boletim.from_api([]).totals
         }
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class HistoryView(View):
+    """Histórico acadêmico de todos os períodos, com estatísticas por período e acumuladas"""
+    
+    @method_decorator(private_revalidate)
+    @require_suap_auth_cbv
+    async def get(self, request):
+        suap_api = get_async_client()
+        access_token = await request.session.aget('access_token')
+        user_data = await request.session.aget('user_data', {})
+        
+        periods = await suap_api.get_academic_periods(access_token)
+        if not periods:
+            return JsonResponse({'error': 'Não foi possível obter os períodos acadêmicos'}, status=502)
+        
+        semesters = [(str(p.get('ano_letivo')), str(p.get('periodo_letivo'))) for p in periods]
+        # O período mais recente (o primeiro da lista do SUAP) ainda está em andamento
+        current = semesters[0]
+        
+        history_store = HistoryStore.for_user(user_data)
+        stored = await history_store.aget() if history_store else {}
+        missing = [semester for semester in semesters[1:] if f'{semester[0]}.{semester[1]}' not in stored]
+        
+        async def period_stats(ano, periodo):
+            with track_stale() as marker:
+                boletim = await aload_boletim(user_data, access_token, ano, periodo)
+            if boletim is None:
+                return None, False
+            return PeriodStats.from_boletim(ano, periodo, boletim), bool(marker)
+        
+        with track_stale() as stale:
+            fetched = await asyncio.gather(*(period_stats(ano, periodo) for ano, periodo in [current] + missing))
+        
+        stats = {key: value for key, value in stored.items() if key != f'{current[0]}.{current[1]}'}
+        closed = {}
+        for index, (item, is_stale) in enumerate(fetched):
+            if item is None:
+                continue
+            stats[item.key] = item
+            # Só guarda períodos encerrados montados a partir de dados atualizados
+            if index > 0 and not is_stale:
+                closed[item.key] = item
+        
+        if history_store and closed:
+            await history_store.aupdate(closed)
+        
+        return json_response(request, {
+            'history': build_history(stats.values()),
+            'current_period': f'{current[0]}.{current[1]}',
+            **stale_info(stale)
+        })
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class MetricsView(View):
+    """Latência, erros e acertos de cache do SUAP no formato texto do Prometheus"""
+    
+    @method_decorator(never_cache)
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if not token or not secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            raise Http404
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class PeriodDataView(View):
+    """Dados de dashboard, relatório e simulador de um período em uma única resposta.
+
+    O boletim é buscado e interpretado uma vez e cada seção é montada a partir
+    dele; ``sections=dashboard,report`` limita a resposta ao que a página usa.
+    """
+    SECTIONS = ('dashboard', 'report', 'simulator', 'solver')
+    
+    @method_decorator(private_revalidate)
+    @require_suap_auth_cbv
+    async def get(self, request):
+        selected_year = request.GET.get('ano')
+        selected_period = request.GET.get('periodo')
+        if not selected_year or not selected_period:
+            return JsonResponse({'error': 'Ano e período são obrigatórios'}, status=400)
+        
+        requested = request.GET.get('sections')
+        sections = [name for name in requested.split(',') if name] if requested else list(self.SECTIONS)
+        unknown = set(sections) - set(self.SECTIONS)
+        if unknown:
+            return JsonResponse({'error': f"Seções inválidas: {', '.join(sorted(unknown))}"}, status=400)
+        if request.GET.get('curso') not in (None, *PESOS):
+            return JsonResponse({'error': 'Tipo de curso inválido'}, status=400)
+        
+        suap_api = get_async_client()
+        access_token = await request.session.aget('access_token')
+        user_data = await request.session.aget('user_data', {})
+        
+        pending = {'grades': suap_api.get_user_grades(access_token, selected_year, selected_period)}
+        if 'dashboard' in sections:
+            pending['diaries'] = suap_api.get_diaries(access_token, f"{selected_year}/{selected_period}")
+        with track_stale() as stale:
+            fetched = dict(zip(pending, await asyncio.gather(*pending.values())))
+        
+        grades = fetched['grades']
+        if grades is None:
+            return JsonResponse({'error': 'Não foi possível obter as notas do período'}, status=502)
+        entry = await aload_period(
+            user_data, access_token, selected_year, selected_period, grades, 'boletim' in stale
+        )
+        boletim = entry[1]
+        curso = request.GET.get('curso')
+        
+        # Tudo de que a resposta depende além do boletim
+        variant = [','.join(sections)]
+        if 'dashboard' in sections:
+            hours = DashboardView.discipline_hours(fetched.get('diaries'))
+            variant.append(hashlib.sha256(dumps(hours)).hexdigest()[:16])
+        if 'solver' in sections:
+            variant.append(curso or f"auto:{user_data.get('curso', '')}")
+        
+        def build():
+            data = {'selected_year': selected_year, 'selected_period': selected_period}
+            if 'dashboard' in sections:
+                data['dashboard'] = DashboardView.page_data(boletim, fetched.get('diaries'), hours)
+            if 'report' in sections:
+                data['report'] = {'report_data': ReportView.process_grades_data(boletim)}
+            if 'simulator' in sections:
+                data['simulator'] = SimulatorView.page_data(grades, boletim)
+            if 'solver' in sections:
+                data['solver'] = SolverView.page_data(boletim, curso, user_data)
+            return data
+        
+        return await period_json(
+            request, user_data, selected_year, selected_period, entry, 'period:' + ':'.join(variant), build, stale
+        )
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class SolverView(View):
+    """Nota mínima na próxima etapa e na prova final e faltas restantes de todas as disciplinas.
+
+    GET resolve o boletim atual; POST recebe ``{"ano", "periodo", "curso", "cenarios": [...]}``
+    e resolve todos os cenários de uma vez, a partir do mesmo boletim.
+    """
+    MAX_SCENARIOS = 50
+    
+    @method_decorator(private_revalidate)
+    @require_suap_auth_cbv
+    async def get(self, request):
+        return await self.respond(request, request.GET.get('ano'), request.GET.get('periodo'), request.GET.get('curso'))
+    
+    @method_decorator(csrf_protect)
+    @require_suap_auth_cbv
+    async def post(self, request):
+        try:
+            payload = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'JSON inválido'}, status=400)
+        scenarios = payload.get('cenarios') or [] if isinstance(payload, dict) else None
+        if not isinstance(scenarios, list) or not all(isinstance(item, dict) for item in scenarios):
+            return JsonResponse({'error': 'Os cenários devem ser uma lista de objetos'}, status=400)
+        if len(scenarios) > self.MAX_SCENARIOS:
+            return JsonResponse({'error': f'No máximo {self.MAX_SCENARIOS} cenários por requisição'}, status=400)
+        return await self.respond(request, payload.get('ano'), payload.get('periodo'), payload.get('curso'), scenarios)
+    
+    async def respond(self, request, ano, periodo, curso, scenarios=()):
+        if not ano or not periodo:
+            return JsonResponse({'error': 'Ano e período são obrigatórios'}, status=400)
         
-        totals['total_frequency'] = round(
-            ((totals['total_classes_given'] - totals['total_absences']) / totals['total_classes_given']) * 100,
-            2
-        ) if totals['total_classes_given'] > 0 else 0
+        access_token = await request.session.aget('access_token')
+        user_data = await request.session.aget('user_data', {})
+        with track_stale() as stale:
+            boletim = await aload_boletim(user_data, access_token, ano, periodo)
+        if boletim is None:
+            return JsonResponse({'error': 'Não foi possível obter as notas do período'}, status=502)
         
-        return totals
\ No newline at end of file
+        try:
+            data = self.page_data(boletim, curso, user_data, scenarios)
+        except (TypeError, ValueError, AttributeError) as e:
+            return JsonResponse({'error': f'Cenário inválido: {e}'}, status=400)
+        return json_response(request, {**data, **stale_info(stale)})
+    
+    @staticmethod
+    def page_data(boletim, curso, user_data, scenarios=()):
+        """Resultado do solver, compartilhado com o PeriodDataView"""
+        curso = curso or detect_course(boletim, user_data.get('curso'))
+        return {'curso': curso, 'cenarios': GradeSolver(boletim, curso).solve(scenarios)}
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class GradeEventsView(View):
+    """Canal SSE (``text/event-stream``) com as mudanças no boletim de um período.
+
+    Cada evento ``delta`` traz só as disciplinas que mudaram (notas, faltas,
+    situação), gerado por um único watcher por aluno e período. Sob WSGI a
+    resposta seria acumulada inteira antes de ser enviada, então o endpoint
+    responde 204, que faz o EventSource parar de reconectar.
+    """
+    
+    @method_decorator(never_cache)
+    @require_suap_auth_cbv
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        
+        ano = request.GET.get('ano')
+        periodo = request.GET.get('periodo')
+        if not ano or not periodo:
+            return JsonResponse({'error': 'Ano e período são obrigatórios'}, status=400)
+        
+        access_token = await request.session.aget('access_token')
+        user_data = await request.session.aget('user_data', {})
+        student = user_data.get('identificacao')
+        if not student:
+            return HttpResponse(status=204)
+        
+        boletim = await aload_boletim(user_data, access_token, ano, periodo)
+        if boletim is None:
+            return JsonResponse({'error': 'Não foi possível obter as notas do período'}, status=502)
+        
+        watcher, queue = watch(student, ano, periodo, boletim, access_token)
+        response = StreamingHttpResponse(self.stream(watcher, queue), content_type='text/event-stream')
+        response['X-Accel-Buffering'] = 'no'  # Proxies como o nginx não devem segurar os eventos
+        return response
+    
+    @staticmethod
+    async def stream(watcher, queue):
+        config = settings.EVENTS
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config['MAX_DURATION']
+        try:
+            yield f"retry: {config['RETRY'] * 1000}\n\n"
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    delta = await asyncio.wait_for(queue.get(), min(config['KEEPALIVE'], remaining))
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"event: delta\ndata: {dumps(delta).decode()}\n\n"
+        finally:
+            watcher.unsubscribe(queue)
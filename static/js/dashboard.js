@@ -3,6 +3,116 @@ function showTableLoading() {
     document.getElementById('loadingOverlay').style.display = 'flex';
 }
 
+// Dados exibidos na tabela, atualizados pelos eventos de mudança no boletim
+let dashboardData = null;
+let gradeEvents = null;
+
+function renderDashboard(data) {
+    // Resumo calculado no servidor com os mesmos critérios da tabela
+    if (data.summary) {
+        document.querySelector('.col-4:nth-child(1) h3').textContent = data.summary.total_subjects;
+        document.querySelector('.col-4:nth-child(2) h3').textContent = data.summary.approved_subjects;
+        document.querySelector('.col-4:nth-child(3) h3').textContent = data.summary.at_risk_subjects;
+    }
+
+    // Atualizar tabela de notas
+    const tbody = document.querySelector('.table tbody');
+    tbody.innerHTML = '';
+
+    // As linhas já chegam unidas aos dados da disciplina
+    if (data.subjects && Array.isArray(data.subjects)) {
+        data.subjects.forEach(subject => {
+            const row = document.createElement('tr');
+            row.className = 'align-middle';
+            if (subject.changed) {
+                row.classList.add('table-warning');
+            }
+
+            const nota1 = subject.nota1 ?? '--';
+            const nota2 = subject.nota2 ?? '--';
+            const media = subject.media ?? '--';
+            const final = subject.nota_final ?? '--';
+            const mediaFinal = subject.media_final ?? '--';
+            const frequencia = (subject.frequencia || 0).toFixed(1);
+
+            row.innerHTML = `
+                <td class="border-0">${subject.disciplina || ''}</td>
+                <td class="border-0 text-center">${subject.carga_horaria || '0'}</td>
+                <td class="border-0 text-center">${subject.carga_horaria_cumprida || '0'}</td>
+                <td class="border-0 text-center">${subject.faltas || '0'}</td>
+                <td class="border-0 text-center">${frequencia}%</td>
+                <td class="border-0 text-center">${nota1}</td>
+                <td class="border-0 text-center">${nota2}</td>
+                <td class="border-0 text-center">${media}</td>
+                <td class="border-0 text-center">${final}</td>
+                <td class="border-0 text-center">${mediaFinal}</td>
+                <td class="border-0 text-center">
+                    ${subject.situacao === "Aprovado"
+                        ? '<span class="status-approved">Aprovado</span>'
+                        : '<span class="status-ongoing">Cursando</span>'}
+                </td>
+                <td class="border-0 text-center">
+                    <button class="btn btn-sm btn-info" onclick="calcularNecessario('${subject.disciplina}', ${nota1 === '--' ? 0 : nota1}, ${nota2 === '--' ? 0 : nota2}, ${subject.carga_horaria || 0}, ${subject.faltas || 0})">
+                        Calcular
+                    </button>
+                </td>
+            `;
+            tbody.appendChild(row);
+        });
+    }
+
+    // Adicionar linha de totais
+    if (data.totals) {
+        const totalsRow = document.createElement('tr');
+        totalsRow.className = 'table fw-bold';
+        totalsRow.innerHTML = `
+            <td class="border-0 text-start">Total:</td>
+            <td class="border-0 text-center">${data.totals.total_classes || 0}</td>
+            <td class="border-0 text-center">${data.totals.total_classes_given || 0}</td>
+            <td class="border-0 text-center">${data.totals.total_absences || 0}</td>
+            <td class="border-0 text-center">${data.totals.total_frequency || 0}%</td>
+            <td class="border-0 text-center" colspan="7">--</td>
+        `;
+        tbody.appendChild(totalsRow);
+    }
+}
+
+// Aplica um evento "delta": só as disciplinas que mudaram, mais totais e resumo
+function applyGradeChanges(delta) {
+    if (!dashboardData) return;
+
+    const subjects = dashboardData.subjects || [];
+    const removed = new Set(delta.removed || []);
+    subjects.forEach(subject => { subject.changed = false; });
+    dashboardData.subjects = subjects.filter(subject => !removed.has(subject.disciplina));
+
+    (delta.subjects || []).forEach(change => {
+        const subject = dashboardData.subjects.find(item => item.disciplina === change.disciplina);
+        if (subject) {
+            Object.assign(subject, change.fields, { changed: true });
+        } else {
+            dashboardData.subjects.push({ disciplina: change.disciplina, ...change.fields, changed: true });
+        }
+    });
+    dashboardData.totals = delta.totals;
+    dashboardData.summary = delta.summary;
+    renderDashboard(dashboardData);
+}
+
+// Um canal de eventos por vez, sempre do período exibido
+function watchGrades(ano, periodo) {
+    if (gradeEvents) {
+        gradeEvents.close();
+        gradeEvents = null;
+    }
+    if (!window.EventSource) return;
+
+    gradeEvents = new EventSource(`/events/grades/?ano=${ano}&periodo=${periodo}`);
+    gradeEvents.addEventListener('delta', event => {
+        applyGradeChanges(JSON.parse(event.data));
+    });
+}
+
 function changePeriod(value) {
     if (!value) return;
     
@@ -10,98 +120,16 @@ function changePeriod(value) {
     const [ano, periodo] = value.split('.');
     if (ano && periodo) {
         // Fazer requisição AJAX em vez de recarregar a página
-        fetch(`${window.location.pathname}?ano=${ano}&periodo=${periodo}`, {
+        fetch(`/period-data/?ano=${ano}&periodo=${periodo}&sections=dashboard`, {
             headers: {
                 'X-Requested-With': 'XMLHttpRequest'
             }
         })
         .then(response => response.json())
-        .then(data => {
-            // Recalcular o resumo acadêmico com base nos mesmos critérios da tabela
-            if (data.grades && Array.isArray(data.grades)) {
-                const summary = {
-                    total_subjects: data.grades.length,
-                    approved_subjects: 0,
-                    at_risk_subjects: 0
-                };
-
-                data.grades.forEach(subject => {
-                    const nota1 = subject.nota_etapa_1?.nota;
-                    const nota2 = subject.nota_etapa_2?.nota;
-                    const media = parseFloat(subject.media_disciplina || 0);
-
-                    if (subject.situacao === "Aprovado" || 
-                        (nota1 !== undefined && nota2 !== undefined && media >= 60)) {
-                        summary.approved_subjects++;
-                    } else {
-                        summary.at_risk_subjects++;
-                    }
-                });
-
-                // Atualizar o resumo na interface
-                document.querySelector('.col-4:nth-child(1) h3').textContent = summary.total_subjects;
-                document.querySelector('.col-4:nth-child(2) h3').textContent = summary.approved_subjects;
-                document.querySelector('.col-4:nth-child(3) h3').textContent = summary.at_risk_subjects;
-            }
-
-            // Atualizar tabela de notas
-            const tbody = document.querySelector('.table tbody');
-            tbody.innerHTML = '';
-
-            if (data.grades && Array.isArray(data.grades)) {
-                data.grades.forEach(subject => {
-                    const row = document.createElement('tr');
-                    row.className = 'align-middle';
-
-                    // Extrair valores com fallbacks seguros
-                    const nota1 = subject.nota_etapa_1?.nota || '--';
-                    const nota2 = subject.nota_etapa_2?.nota || '--';
-                    const media = subject.media_disciplina || '--';
-                    const final = subject.nota_avaliacao_final?.nota || '--';
-                    const mediaFinal = subject.media_final_disciplina || '--';
-                    const frequencia = (subject.percentual_carga_horaria_frequentada || 0).toFixed(1);
-
-                    row.innerHTML = `
-                        <td class="border-0">${subject.disciplina || ''}</td>
-                        <td class="border-0 text-center">${subject.carga_horaria || '0'}</td>
-                        <td class="border-0 text-center">${subject.carga_horaria_cumprida || '0'}</td>
-                        <td class="border-0 text-center">${subject.numero_faltas || '0'}</td>
-                        <td class="border-0 text-center">${frequencia}%</td>
-                        <td class="border-0 text-center">${nota1}</td>
-                        <td class="border-0 text-center">${nota2}</td>
-                        <td class="border-0 text-center">${media}</td>
-                        <td class="border-0 text-center">${final}</td>
-                        <td class="border-0 text-center">${mediaFinal}</td>
-                        <td class="border-0 text-center">
-                            ${(subject.situacao === "Aprovado" || 
-                               (nota1 !== '--' && nota2 !== '--' && parseFloat(media) >= 60))
-                                ? '<span class="status-approved">Aprovado</span>'
-                                : '<span class="status-ongoing">Cursando</span>'}
-                        </td>
-                        <td class="border-0 text-center">
-                            <button class="btn btn-sm btn-info" onclick="calcularNecessario('${subject.disciplina}', ${nota1 === '--' ? 0 : nota1}, ${nota2 === '--' ? 0 : nota2}, ${subject.carga_horaria || 0}, ${subject.numero_faltas || 0})">
-                                Calcular
-                            </button>
-                        </td>
-                    `;
-                    tbody.appendChild(row);
-                });
-            }
-
-            // Adicionar linha de totais
-            if (data.totals) {
-                const totalsRow = document.createElement('tr');
-                totalsRow.className = 'table fw-bold';
-                totalsRow.innerHTML = `
-                    <td class="border-0 text-start">Total:</td>
-                    <td class="border-0 text-center">${data.totals.total_classes || 0}</td>
-                    <td class="border-0 text-center">${data.totals.total_classes_given || 0}</td>
-                    <td class="border-0 text-center">${data.totals.total_absences || 0}</td>
-                    <td class="border-0 text-center">${data.totals.total_frequency || 0}%</td>
-                    <td class="border-0 text-center" colspan="7">--</td>
-                `;
-                tbody.appendChild(totalsRow);
-            }
+        .then(({ dashboard: data }) => {
+            dashboardData = data;
+            renderDashboard(data);
+            watchGrades(ano, periodo);
 
             // Atualizar URL sem recarregar
             const url = new URL(window.location);
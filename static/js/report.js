@@ -66,24 +66,8 @@ function changePeriod(value) {
         url.searchParams.set('ano', ano);
         url.searchParams.set('periodo', periodo);
         
-        // Fazer requisição AJAX
-        fetch(url, {
-            headers: {
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-        })
-        .then(response => {
-            if (!response.ok) {
-                throw new Error('Erro na requisição');
-            }
-            // Recarregar a página com os novos parâmetros
-            window.location.href = url;
-        })
-        .catch(error => {
-            console.error('Erro ao carregar dados:', error);
-            document.getElementById('loadingOverlay').style.display = 'none';
-            alert('Erro ao carregar os dados. Por favor, tente novamente.');
-        });
+        // A página já vem renderizada com o relatório: uma única ida ao servidor
+        window.location.href = url;
     }
 }
 